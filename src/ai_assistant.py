@@ -6,6 +6,7 @@ Compatible with Python 3.8-3.12
 
 import os
 import json
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -67,9 +68,13 @@ class AIAssistant:
         self.model = None
         self.chat_session = None
         self.chat_history = []
-        # Debounced persistence settings
-        self._last_history_save_ts = 0.0
-        self._history_save_min_interval = 2.0  # seconds
+        # New interactions are written in batches by flush_chat_history
+        self._history_dirty = False
+        self._history_lock = threading.Lock()
+        # Serializes whole saves so an older snapshot never lands last
+        self._history_write_lock = threading.Lock()
+        # Set by close_history; answers arriving after that are not recorded
+        self._history_closed = False
         
         # Load API key from .env file
         self.load_api_key_from_env()
@@ -514,9 +519,17 @@ Answer:"""
         return "\n".join(content_parts)
         
     def add_to_history(self, interaction: Dict[str, Any]):
-        """Add interaction to chat history."""
-        self.chat_history.append(interaction)
-        self.save_chat_history()
+        """Add interaction to chat history; flush_chat_history persists it."""
+        with self._history_lock:
+            if self._history_closed:
+                return
+            self.chat_history.append(interaction)
+            self._history_dirty = True
+        
+    def close_history(self):
+        """Stop recording new interactions ahead of the final flush."""
+        with self._history_lock:
+            self._history_closed = True
         
     def load_chat_history(self):
         """Load chat history from file."""
@@ -530,19 +543,24 @@ Answer:"""
             
     def save_chat_history(self):
         """Save chat history to file."""
-        try:
-            # Debounce disk writes
-            now = datetime.now().timestamp()
-            if now - self._last_history_save_ts < self._history_save_min_interval:
-                return
-            # Keep only last 100 interactions
-            if len(self.chat_history) > 100:
-                self.chat_history = self.chat_history[-100:]
-            with open(self.chat_history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.chat_history, f, indent=2, ensure_ascii=False)
-            self._last_history_save_ts = now
-        except Exception as e:
-            print(f"Error saving chat history: {e}")
+        with self._history_write_lock:
+            with self._history_lock:
+                # Keep only last 100 interactions
+                if len(self.chat_history) > 100:
+                    self.chat_history = self.chat_history[-100:]
+                snapshot = list(self.chat_history)
+                self._history_dirty = False
+            try:
+                with open(self.chat_history_file, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            except Exception as e:
+                print(f"Error saving chat history: {e}")
+                self._history_dirty = True
+            
+    def flush_chat_history(self):
+        """Write the history once for everything added since the last save."""
+        if self._history_dirty:
+            self.save_chat_history()
             
     def get_chat_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent chat history."""
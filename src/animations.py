@@ -174,7 +174,9 @@ class CircularProgress(tk.Canvas):
     """Modern circular progress indicator."""
     
     def __init__(self, parent, size: int = 200, line_width: int = 20, 
-                 color: str = "#B8956A", bg_color: str = "#3A3027", **kwargs):
+                 color: str = "#B8956A", bg_color: str = "#3A3027",
+                 text_font=None, text_color: Optional[str] = None,
+                 show_percent: bool = True, **kwargs):
         super().__init__(parent, width=size, height=size, 
                         highlightthickness=0, bg=kwargs.get('bg', '#2D2520'), **kwargs)
         
@@ -183,6 +185,13 @@ class CircularProgress(tk.Canvas):
         self.color = color
         self.bg_color = bg_color
         self.progress = 0
+        # With show_percent off, the center text is owned by set_text
+        self.show_percent = show_percent
+        
+        # Last values pushed to the canvas items, and the running animation
+        self._shown_extent = 0.0
+        self._shown_text = "0%" if show_percent else ""
+        self._anim_job = None
         
         # Draw background circle
         padding = 10
@@ -201,8 +210,8 @@ class CircularProgress(tk.Canvas):
         
         # Center text
         self.text = self.create_text(
-            size // 2, size // 2, text="0%", 
-            font=("Arial", size // 8, "bold"), fill=color
+            size // 2, size // 2, text=self._shown_text, 
+            font=text_font or ("Arial", size // 8, "bold"), fill=text_color or color
         )
     
     def set_progress(self, value: float, animated: bool = True):
@@ -210,11 +219,19 @@ class CircularProgress(tk.Canvas):
         if animated:
             self.animate_to(value)
         else:
+            self._cancel_animation()
             self.progress = value
             self.update_display()
     
+    def _cancel_animation(self):
+        """Stop a running animate_to so two loops never fight over the arc."""
+        if self._anim_job is not None:
+            self.after_cancel(self._anim_job)
+            self._anim_job = None
+    
     def animate_to(self, target: float, duration: int = 500):
         """Animate progress to target value."""
+        self._cancel_animation()
         start_value = self.progress
         start_time = self.tk.call('clock', 'milliseconds')
         
@@ -229,15 +246,32 @@ class CircularProgress(tk.Canvas):
             self.update_display()
             
             if progress_ratio < 1.0:
-                self.after(16, step)
+                self._anim_job = self.after(16, step)
+            else:
+                self._anim_job = None
         
         step()
     
     def update_display(self):
         """Update the visual display."""
-        extent = -(self.progress / 100) * 360
-        self.itemconfig(self.progress_arc, extent=extent)
-        self.itemconfig(self.text, text=f"{int(self.progress)}%")
+        # Only touch the items whose value actually changed
+        extent = round(-(self.progress / 100) * 360, 1)
+        if extent != self._shown_extent:
+            self.itemconfig(self.progress_arc, extent=extent)
+            self._shown_extent = extent
+            
+        if self.show_percent:
+            self.set_text(f"{int(self.progress)}%")
+            
+    def set_text(self, text: str):
+        """Set the center text (skipped if unchanged)."""
+        if text != self._shown_text:
+            self.itemconfig(self.text, text=text)
+            self._shown_text = text
+            
+    def set_text_color(self, color: str):
+        """Set the center text color."""
+        self.itemconfig(self.text, fill=color)
 
 
 class ModernButton(tk.Canvas):
@@ -449,31 +483,30 @@ class StatCard(tk.Frame):
                                    fg="#F5EBE0", font=("Arial", 32, "bold"))
         self.value_label.pack(pady=(10, 0))
         
-        # Bind hover effect
-        self.bind("<Enter>", self.on_enter)
-        self.bind("<Leave>", self.on_leave)
-        for child in self.winfo_children():
-            child.bind("<Enter>", self.on_enter)
-            child.bind("<Leave>", self.on_leave)
+        # Bind hover effect once, on a bind tag shared by the card and all its labels
+        self._hover_widgets = (self, title_frame, title_label, self.value_label)
+        if icon:
+            self._hover_widgets += (icon_label,)
+        hover_tag = f"StatCardHover{id(self)}"
+        for widget in self._hover_widgets:
+            widget.bindtags((hover_tag,) + widget.bindtags())
+        self.bind_class(hover_tag, "<Enter>", self.on_enter)
+        self.bind_class(hover_tag, "<Leave>", self.on_leave)
     
     def on_enter(self, event):
         """Hover effect."""
-        self.config(bg="#4A3F35")
-        for child in self.winfo_children():
-            cfg = getattr(child, "config", None)
-            if callable(cfg):
-                cfg(bg="#4A3F35")
+        for widget in self._hover_widgets:
+            widget.config(bg="#4A3F35")
     
     def on_leave(self, event):
         """Leave hover."""
-        self.config(bg=self.bg_color)
-        for child in self.winfo_children():
-            cfg = getattr(child, "config", None)
-            if callable(cfg):
-                cfg(bg=self.bg_color)
+        for widget in self._hover_widgets:
+            widget.config(bg=self.bg_color)
     
     def update_value(self, new_value: str, animated: bool = True):
-        """Update the card value."""
+        """Update the card value (skipped, flash included, if unchanged)."""
+        if new_value == self.current_value:
+            return
         self.current_value = new_value
         if animated:
             # Simple update with flash effect
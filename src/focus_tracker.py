@@ -6,6 +6,7 @@ Compatible with Python 3.8-3.12
 import cv2
 import mediapipe as mp
 import numpy as np
+import threading
 import time
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Callable
@@ -18,6 +19,54 @@ except ImportError:
     YOLO_AVAILABLE = False
     print("Warning: ultralytics not installed. Phone detection will be disabled.")
 
+# Numba is optional - without it the kernels below run as plain Python.
+# Compiled, they run with the GIL released so the Tk thread keeps going.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit('f8(f8[:, :])', cache=True, fastmath=True, nogil=True)
+def _ear_kernel(pts):
+    """Eye Aspect Ratio from 6 (x, y) eye contour points."""
+    a = np.sqrt((pts[1, 0] - pts[5, 0]) ** 2 + (pts[1, 1] - pts[5, 1]) ** 2)
+    b = np.sqrt((pts[2, 0] - pts[4, 0]) ** 2 + (pts[2, 1] - pts[4, 1]) ** 2)
+    c = np.sqrt((pts[0, 0] - pts[3, 0]) ** 2 + (pts[0, 1] - pts[3, 1]) ** 2)
+    if a + b == 0.0:
+        return 0.0
+    return (2.0 * c) / (a + b)
+
+
+# fastmath minus 'nnan': this kernel returns NaN on purpose
+@njit('f8(f8[:, :])', cache=True, fastmath={'ninf', 'nsz', 'arcp', 'contract', 'afn', 'reassoc'},
+      nogil=True)
+def _gaze_ratio_kernel(pts):
+    """Average horizontal iris position within both eyes (NaN if undefined).
+    
+    pts rows: 4 left iris, 4 right iris, then left corner, right corner,
+    left outer corner, right outer corner.
+    """
+    left_x = (pts[0, 0] + pts[1, 0] + pts[2, 0] + pts[3, 0]) / 4.0
+    right_x = (pts[4, 0] + pts[5, 0] + pts[6, 0] + pts[7, 0]) / 4.0
+    
+    left_width = np.sqrt((pts[8, 0] - pts[10, 0]) ** 2 + (pts[8, 1] - pts[10, 1]) ** 2)
+    right_width = np.sqrt((pts[9, 0] - pts[11, 0]) ** 2 + (pts[9, 1] - pts[11, 1]) ** 2)
+    if left_width == 0.0 or right_width == 0.0:
+        # Any finite value, negative ones included, is a real reading
+        return np.nan
+    
+    left_ratio = (left_x - pts[10, 0]) / left_width
+    right_ratio = (right_x - pts[11, 0]) / right_width
+    return (left_ratio + right_ratio) / 2.0
+
 class FocusTracker:
     """Advanced focus tracking using MediaPipe face mesh and eye detection."""
     
@@ -71,6 +120,16 @@ class FocusTracker:
         self.camera = None
         self.camera_index = 0
         
+        # While tracking, a capture thread keeps only the newest frame and
+        # sets frame_event when one arrives
+        self._capture_thread = None
+        self._capture_running = False
+        self._frame_lock = threading.Lock()
+        self._latest_frame = None
+        self.frame_event = threading.Event()
+        # Frames are grabbed at camera rate but only decoded at this rate
+        self.decode_fps = 10.0
+        
         # Eye tracking parameters - SIMPLIFIED: Focus on head pose only
         self.FOCUS_THRESHOLD = 0.5  # Overall focus threshold
         self.DISTRACTION_TIME_LIMIT = 3.0  # Seconds before alerting
@@ -98,11 +157,16 @@ class FocusTracker:
         # Gaze direction landmarks
         self.LEFT_IRIS = [474, 475, 476, 477]
         self.RIGHT_IRIS = [469, 470, 471, 472]
+        # Row layout expected by _gaze_ratio_kernel
+        self.GAZE_POINTS = self.LEFT_IRIS + self.RIGHT_IRIS + [33, 263, 133, 362]
         
         # Session data
         self.session_start_time = None
         self.focus_events = []
         self.distraction_count = 0
+        # Running totals over focus_events so the stats need no pass over it
+        self._focused_total = 0
+        self._score_total = 0.0
         
         # Display settings
         self.show_outline = True  # Show face/eye tracking outline by default
@@ -110,6 +174,11 @@ class FocusTracker:
         # Callbacks
         self.distraction_callback = None
         
+        # Per-frame RGB copy shared by the MediaPipe models, and the face
+        # mesh result of the last analyzed frame (reused for the outline)
+        self._rgb_buf = None
+        self._last_face_results = None
+        
     def set_sensitivity(self, sensitivity: str):
         """
         Adjust focus detection sensitivity based on head pose angles.
@@ -155,6 +224,8 @@ class FocusTracker:
     def initialize_camera(self, camera_index: int = 0) -> bool:
         """Initialize camera for face tracking."""
         try:
+            capturing = self._capture_thread is not None
+            self._stop_capture()
             if self.camera is not None:
                 self.camera.release()
                 
@@ -165,11 +236,18 @@ class FocusTracker:
                 print(f"Error: Could not open camera {camera_index}")
                 return False
                 
-            # Set camera properties
+            # Set camera properties - ask for MJPEG (less USB bandwidth,
+            # no driver-side YUV conversion) before the size, since some
+            # backends only honour the format on the next size change
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            # Keep only the newest frame so analysis never lags behind
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.camera.set(cv2.CAP_PROP_FPS, 30)
             
+            if capturing:
+                self._start_capture()
             print(f"Camera {camera_index} initialized successfully")
             return True
             
@@ -182,38 +260,87 @@ class FocusTracker:
         self.is_tracking = True
         self.session_start_time = time.time()
         self.focus_events.clear()
+        self._focused_total = 0
+        self._score_total = 0.0
         self.distraction_count = 0
         self.last_focus_time = time.time()
+        self._start_capture()
         print("Focus tracking started")
         
     def stop_tracking(self):
         """Stop focus tracking session."""
         self.is_tracking = False
+        self._stop_capture()
         print("Focus tracking stopped")
         
+    def _start_capture(self):
+        """Start the capture thread if the camera is open."""
+        if self._capture_thread is None and self.camera is not None and self.camera.isOpened():
+            self._capture_running = True
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
+            
+    def _stop_capture(self):
+        """Stop the capture thread and drop any unread frame."""
+        self._capture_running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+        with self._frame_lock:
+            self._latest_frame = None
+            self.frame_event.clear()
+            
+    def grab(self) -> bool:
+        """Pull the next frame from the driver without decoding it."""
+        return self.camera.grab()
+        
+    def retrieve(self):
+        """Decode the last grabbed frame; None if that fails."""
+        ret, frame = self.camera.retrieve()
+        return frame if ret else None
+        
+    def _capture_loop(self):
+        """Drain the camera at its own rate, decoding only decode_fps frames (capture thread)."""
+        last_decode = 0.0
+        while self._capture_running:
+            if not self.grab():
+                time.sleep(0.05)
+                continue
+            
+            # Grabbing every frame keeps the driver queue empty; the JPEG
+            # decode is the expensive part and most frames would be dropped
+            now = time.monotonic()
+            if now - last_decode < 1.0 / self.decode_fps:
+                continue
+            frame = self.retrieve()
+            if frame is None:
+                continue
+            last_decode = now
+            
+            # Single slot: a frame nobody picked up yet is simply replaced
+            with self._frame_lock:
+                self._latest_frame = frame
+                self.frame_event.set()
+                
+    def _take_frame(self, timeout: float = 0.1):
+        """Wait for a frame newer than the last one taken; None on timeout."""
+        if not self.frame_event.wait(timeout):
+            return None
+        with self._frame_lock:
+            frame, self._latest_frame = self._latest_frame, None
+            self.frame_event.clear()
+        return frame
+        
     def calculate_ear(self, eye_landmarks) -> float:
         """Calculate Eye Aspect Ratio."""
         try:
             if len(eye_landmarks) < 6:
                 return 0.0
-                
-            # Vertical distances
-            A = np.linalg.norm(eye_landmarks[1] - eye_landmarks[5])
-            B = np.linalg.norm(eye_landmarks[2] - eye_landmarks[4])
             
-            # Horizontal distance  
-            C = np.linalg.norm(eye_landmarks[0] - eye_landmarks[3])
-            
-            # Prevent division by zero
-            if A + B == 0:
-                return 0.0
-            
-            # EAR calculation - CORRECTED FORMULA
             # EAR = horizontal / vertical (higher when eyes open, lower when closed)
-            ear = (2.0 * C) / (A + B)
-            return ear
+            return float(_ear_kernel(eye_landmarks))
             
-        except (IndexError, ZeroDivisionError, Exception) as e:
+        except Exception:
             return 0.0
             
     def extract_eye_landmarks(self, landmarks, eye_indices) -> np.ndarray:
@@ -222,38 +349,18 @@ class FocusTracker:
         for idx in eye_indices:  # Use all 6 points
             point = landmarks.landmark[idx]
             eye_points.append([point.x, point.y])
-        return np.array(eye_points)
+        return np.array(eye_points, dtype=np.float64)
         
     def estimate_gaze_direction(self, landmarks, frame_shape) -> str:
         """Estimate gaze direction (left, center, right)."""
         try:
-            # Get iris centers
-            left_iris_center = np.mean([[landmarks.landmark[i].x, landmarks.landmark[i].y] 
-                                       for i in self.LEFT_IRIS], axis=0)
-            right_iris_center = np.mean([[landmarks.landmark[i].x, landmarks.landmark[i].y] 
-                                        for i in self.RIGHT_IRIS], axis=0)
-            
-            # Get eye corners for reference
-            left_corner = np.array([landmarks.landmark[33].x, landmarks.landmark[33].y])
-            right_corner = np.array([landmarks.landmark[263].x, landmarks.landmark[263].y])
-            
-            # Get eye outer corners
-            left_outer = np.array([landmarks.landmark[133].x, landmarks.landmark[133].y])
-            right_outer = np.array([landmarks.landmark[362].x, landmarks.landmark[362].y])
-            
-            # Calculate eye widths
-            left_eye_width = np.linalg.norm(left_corner - left_outer)
-            right_eye_width = np.linalg.norm(right_corner - right_outer)
-            
-            # Prevent division by zero
-            if left_eye_width == 0 or right_eye_width == 0:
-                return "center"
-            
-            # Calculate relative positions
-            left_ratio = (left_iris_center[0] - left_outer[0]) / left_eye_width
-            right_ratio = (right_iris_center[0] - right_outer[0]) / right_eye_width
+            # Iris points plus eye corners (33/263) and outer corners (133/362)
+            pts = self.extract_eye_landmarks(landmarks, self.GAZE_POINTS)
+            avg_ratio = _gaze_ratio_kernel(pts)
             
-            avg_ratio = (left_ratio + right_ratio) / 2
+            # Degenerate eye width - no reading this frame
+            if np.isnan(avg_ratio):
+                return "center"
             
             if avg_ratio < 0.35:
                 return "left"
@@ -262,7 +369,7 @@ class FocusTracker:
             else:
                 return "center"
                 
-        except (IndexError, AttributeError, ZeroDivisionError, Exception) as e:
+        except Exception:
             return "center"
             
     def estimate_head_pose(self, landmarks, frame_shape) -> Tuple[float, float, float]:
@@ -424,7 +531,14 @@ class FocusTracker:
             print(f"Phone detection error: {e}")
         return False, 0.0, None
     
-    def detect_hands_near_face(self, frame, face_landmarks=None) -> Tuple[bool, int, Optional[List]]:
+    def _to_rgb(self, frame) -> np.ndarray:
+        """Convert a BGR frame to RGB into a buffer reused across frames."""
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        
+    def detect_hands_near_face(self, frame, face_landmarks=None,
+                               rgb_frame=None) -> Tuple[bool, int, Optional[List]]:
         """
         Detect hands near the face area using MediaPipe hands.
         This can indicate phone usage even when phone is partially obscured.
@@ -445,7 +559,8 @@ class FocusTracker:
             now = time.time()
             if now - self._last_hand_check_time < self._hand_check_interval:
                 return self._last_hand_result
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if rgb_frame is None:
+                rgb_frame = self._to_rgb(frame)
             hand_results = self.hands.process(rgb_frame)
             
             if not hand_results.multi_hand_landmarks:
@@ -504,8 +619,12 @@ class FocusTracker:
         # Detect phone first (if enabled)
         phone_detected, phone_confidence, phone_boxes = self.detect_phone(frame)
         
+        # One RGB conversion per frame, shared by the hand and face models
+        rgb_frame = self._to_rgb(frame)
+        
         # Detect hands near face (additional signal for phone usage)
-        hands_near_face, hand_count, hand_boxes = self.detect_hands_near_face(frame)
+        hands_near_face, hand_count, hand_boxes = self.detect_hands_near_face(
+            frame, rgb_frame=rgb_frame)
         
         # Combine detection boxes for visualization
         all_detection_boxes = []
@@ -514,9 +633,8 @@ class FocusTracker:
         if hand_boxes:
             all_detection_boxes.extend(hand_boxes)
             
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.face_mesh.process(rgb_frame)
+        self._last_face_results = results
         
         if not results.multi_face_landmarks:
             return {
@@ -637,6 +755,8 @@ class FocusTracker:
                 "hand_count": hand_count
             }
             self.focus_events.append(event)
+            self._focused_total += bool(is_focused)
+            self._score_total += focus_score
         
         details = f"EAR: {avg_ear:.2f}, Gaze: {gaze_direction}, Pose: {pitch:.1f}°/{yaw:.1f}°/{roll:.1f}°"
         if phone_detected:
@@ -663,14 +783,18 @@ class FocusTracker:
         if not self.camera or not self.camera.isOpened():
             return None, None
             
-        ret, frame = self.camera.read()
-        if not ret:
+        if self._capture_thread is not None:
+            frame = self._take_frame()
+        else:
+            ret, frame = self.camera.read()
+        if frame is None:
             return None, None
             
         # Flip horizontally for mirror effect
         frame = cv2.flip(frame, 1)
         
         # Analyze focus
+        self._last_face_results = None
         focus_data = self.analyze_focus_level(frame)
         
         # Draw phone detection bounding boxes first (so they appear behind other annotations)
@@ -702,11 +826,11 @@ class FocusTracker:
         
         # Draw annotations
         if focus_data["focus_score"] > 0 and self.show_outline:
-            # Draw face mesh only if outline is enabled
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb_frame)
+            # Draw face mesh only if outline is enabled - reuse the landmarks
+            # from the analysis instead of running the model again
+            results = self._last_face_results
             
-            if results.multi_face_landmarks:
+            if results is not None and results.multi_face_landmarks:
                 for face_landmarks in results.multi_face_landmarks:
                     # Draw eye contours
                     self.mp_drawing.draw_landmarks(
@@ -776,15 +900,12 @@ class FocusTracker:
         current_time = time.time()
         total_time = current_time - self.session_start_time if self.session_start_time else 0
         
-        # Calculate focus statistics
-        focused_events = [e for e in self.focus_events if e["is_focused"]]
-        focus_time = len(focused_events)
+        # Calculate focus statistics from the running totals
+        focus_time = self._focused_total
         total_events = len(self.focus_events)
         
-        focus_percentage = (focus_time / total_events * 100) if total_events > 0 else 0
-        
-        focus_scores = [e["focus_score"] for e in self.focus_events]
-        avg_focus_score = sum(focus_scores) / len(focus_scores) if focus_scores else 0
+        focus_percentage = focus_time / total_events * 100
+        avg_focus_score = self._score_total / total_events
         
         return {
             "total_time": total_time,
@@ -798,9 +919,10 @@ class FocusTracker:
         
     def cleanup(self):
         """Clean up resources."""
+        # Stop the capture thread before releasing the camera it reads from
+        self.stop_tracking()
         if self.camera:
             self.camera.release()
         if hasattr(self, 'hands'):
             self.hands.close()
-        self.stop_tracking()
         print("Focus tracker cleaned up")
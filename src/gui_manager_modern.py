@@ -5,13 +5,19 @@ Compatible with Python 3.8-3.12
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-import threading
+from tkinter import font as tkfont
 import time
 import os
+import threading
+import calendar
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Any
 import cv2
-from PIL import Image, ImageTk
+import numpy as np
 
 # Import our modules
 from focus_tracker import FocusTracker
@@ -23,6 +29,132 @@ from animations import (AnimationEngine, CircularProgress, ModernButton,
                         ToastNotification, StatCard)
 
 
+# Productivity report layout, parsed once and filled with format_map
+REPORT_TPL = (
+    "PRODUCTIVITY REPORT - Last {days} Days\n"
+    "Generated: {ts}\n"
+    "\n"
+    "OVERVIEW\n"
+    "========\n"
+    "Total Sessions: {total_sessions}\n"
+    "Total Study Time: {total_study_time}\n"
+    "Average Session: {average_session}\n"
+    "Overall Focus: {overall_focus:.1f}%\n"
+    "Efficiency: {efficiency:.1f}%\n"
+    "Total Distractions: {total_distractions}\n"
+    "\n"
+    "DAILY BREAKDOWN\n"
+    "===============\n"
+)
+ROW_TPL = "{date}: {sessions} sessions, {study_time}, {distractions} distractions\n"
+
+# Quick-link cards have a fixed size so visible rows can be computed; their
+# name and URL are cut to one line each so the Open button always fits
+MATERIAL_COLUMNS = 3
+MATERIAL_ROW_HEIGHT = 190
+
+# Date format used on Recent Chats entries
+SESSION_DATE_FMT = "%B %d, %Y at %I:%M %p"
+
+# Uploaded material cards share one height so only the visible ones are built;
+# the description is cut to one line so the Delete button always fits
+UPLOAD_ROW_HEIGHT = 170
+
+# File dialog filters for study material uploads
+_UPLOAD_FILETYPES = (
+    ("All Supported", "*.txt *.md *.pdf *.docx *.doc *.pptx *.ppt *.xlsx *.xls *.py *.java *.cpp *.js *.html *.css *.json"),
+    ("PDF Files", "*.pdf"),
+    ("Word Documents", "*.docx *.doc"),
+    ("PowerPoint", "*.pptx *.ppt"),
+    ("Excel Files", "*.xlsx *.xls"),
+    ("Text files", "*.txt"),
+    ("Markdown", "*.md"),
+    ("Code files", "*.py *.java *.cpp *.js *.html *.css *.json"),
+    ("All files", "*.*"),
+)
+
+WELCOME_TEXT = (
+    "Welcome to AI Study Assistant! 👋\n\n"
+    "You can ask me questions in two modes:\n"
+    "🌐 Internet Mode: Get answers from the web\n"
+    "📚 My Materials Mode: Get answers only from your uploaded study materials\n\n"
+    "💡 Tip: Click '📜 Recent Chats' to view your previous conversations!\n\n"
+)
+
+# Theme switching: which color options are restyled per widget class, and
+# which role wins when two theme colors share a hex value
+_THEMED_OPTIONS = {
+    'Frame': ('bg',),
+    'Label': ('bg', 'fg'),
+    'Canvas': ('bg',),
+    'Button': ('bg', 'fg'),
+}
+_THEME_ROLE_ORDER = ("bg", "card_bg", "bg_secondary", "fg", "fg_secondary", "fg_muted")
+
+# Chat display keeps only the newest lines; full history lives in Recent Chats
+MAX_CHAT_LINES = 500
+
+# Focus score shown on the dashboard is the mean of the last N samples
+FOCUS_WINDOW = 32
+
+
+# Settings that only take effect when the user presses Save
+APPLY_ON_SAVE_SETTINGS = ("theme.mode", "camera.device_index")
+
+
+_MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December")
+
+
+def _fast_format_iso(s, fmt):
+    """Format a canonical isoformat() string by slicing; None if it can't."""
+    if len(s) < 16 or s[4] != "-" or s[7] != "-" or s[10] not in "T " or s[13] != ":":
+        return None
+    if not (s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16]).isdigit():
+        return None
+    year, month, day = int(s[0:4]), int(s[5:7]), int(s[8:10])
+    # Anything out of range goes through fromisoformat() and its errors
+    if not (year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+            and int(s[11:13]) < 24 and int(s[14:16]) < 60):
+        return None
+    if fmt == "%Y-%m-%d %H:%M":
+        return f"{s[:10]} {s[11:16]}"
+    if fmt == SESSION_DATE_FMT:
+        h = int(s[11:13])
+        return (f"{_MONTHS[month - 1]} {s[8:10]}, {s[0:4]} at "
+                f"{h % 12 or 12:02d}:{s[14:16]} {'AM' if h < 12 else 'PM'}")
+    return None
+
+
+def _elide(text, font, max_width):
+    """Cut text to one line of at most max_width pixels, ending in an ellipsis."""
+    text = " ".join(text.split())
+    if font.measure(text) <= max_width:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if font.measure(text[:mid] + "…") <= max_width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "…"
+
+
+def _fmt_date(item, key, fmt, fallback=None):
+    """Format an ISO timestamp field, caching the result on the dict."""
+    cache_key = f"_cached_{key}_{fmt}"
+    text = item.get(cache_key)
+    if text is None:
+        value = item.get(key) or ""
+        try:
+            text = _fast_format_iso(value, fmt) or datetime.fromisoformat(value).strftime(fmt)
+        except (TypeError, ValueError, IndexError):
+            text = value if fallback is None else fallback
+        item[cache_key] = text
+    return text
+
+
 class ModernStudyFocusGUI:
     """Modern GUI with sidebar navigation and animated components."""
     
@@ -45,17 +177,114 @@ class ModernStudyFocusGUI:
         self.session_active = False
         self.camera_feed_active = False
         
-        # Threading
-        self.camera_thread = None
-        self.gui_update_thread = None
-        self.running = False
+        # Theme and camera actually in use; settings edits only reach
+        # config until save_settings applies them
+        self._active_theme = None
+        self._active_camera_index = 0
+        
+        # Plain-Python copies of the alert toggles so the distraction path
+        # (called from the tracking thread) never touches Tk or walks config
+        self._sounds_enabled = bool(self.config_manager.get("notifications.sounds", True))
+        self._notifications_enabled = bool(self.config_manager.get("notifications.enabled", True))
+        
+        # Capture + inference runs on a single-worker executor while a
+        # session is active; results are picked up on the Tk thread
+        self._analyzer = None
+        self._analysis_job = None
+        self._pulse_pending = False
+        # Seconds between frame starts; frames the capture thread decodes in
+        # between are simply replaced, so a lower rate just drops frames
+        self._analysis_interval = 1.0 / max(1, int(self.config_manager.get("camera.preview_fps", 10)))
+        self._analysis_deadline = 0.0
+        self._analysis_cost = 0.0  # running average of job time, seconds
+        
+        # Sound/notification calls can block on OS APIs - keep them off the
+        # tracking thread and drop repeats that arrive within the throttle window
+        self._io_executor = ThreadPoolExecutor(max_workers=2)
+        self._last_alert_time = 0.0
+        self._alert_throttle = 2.0  # seconds
+        
+        # AI assistant calls are network-bound and have no timeout, so they run
+        # on daemon threads (at most two at once) that can't hold up exit;
+        # results are polled from Tk
+        self._ai_slots = threading.BoundedSemaphore(2)
+        self._ai_future = None
+        self._truncated_lines = 0
+        # Recent chat sessions, regrouped only after the history changes
+        self._sessions_cache = []
+        self._sessions_cache_dirty = True
+        self._sessions_future = None
+        self._history_flush_job = None
+        self._history_flush_future = None
+        # Uploaded materials, rescanned only after an upload or delete
+        self._materials_cache = []
+        self._materials_cache_dirty = True
+        # Dialogs kept hidden between uses; dropped on theme change
+        self._recent_dialog = None
+        self._recent_dialog_sessions = None
+        self._hovered_session = None
+        self._upload_dialog = None
+        self._add_link_dialog = None
+        self._upload_path = None
+        
+        # Focus samples are buffered here and handed to the session
+        # manager once per second instead of on every analyzed frame
+        self._focus_ring = deque(maxlen=600)
+        self._last_flush = 0.0
+        
+        # Camera preview image, reused across frames
+        self._photo = None
+        self._photo_size = None
+        self._label_size = (0, 0)
+        self._display_cache = None  # ((src_w, src_h), (dst_w, dst_h))
+        self._resize_buf = None
+        self._ppm_buf = None  # PPM header + RGB pixels handed to PhotoImage.put
+        self._ppm_pixels = None  # numpy view of the pixel part of _ppm_buf
+        self._ppm_size = None
+        
+        # Analytics report render cache
+        self._report_cache_key = None
+        
+        # Dashboard label state, written by callbacks and applied by _ui_tick;
+        # the session timer thread writes it too, hence the lock
+        self._pending_state = {}
+        self._state_lock = threading.Lock()
+        self._status_text_key = None
+        self._last_state = {}
+        
+        # Recent focus scores (ring buffer) behind the dashboard score label
+        self._focus_buf = np.zeros(FOCUS_WINDOW, dtype=np.float32)
+        self._focus_count = 0
+        self._focus_count_shown = 0
         
         # Theme colors
         self.colors = {}
         
+        # Dashboard scrollregion refresh is coalesced through after_idle
+        self._scrollregion_pending = False
+        # Size of the dashboard content frame: last seen / last applied
+        self._dashboard_extent = None
+        self._dashboard_scrollregion = None
+        # Virtualized list renders queued for the next idle point
+        self._idle_pending = set()
+        # List canvas sizes as last reported by <Configure>, so scroll
+        # renders need no winfo_width/height round-trips
+        self._canvas_sizes = {}
+        
         # View containers
         self.views = {}
         self.sidebar_buttons = {}
+        # ModernButtons recolored by semantic role on theme change
+        self._modern_buttons = []
+        
+        # Session labels - created in initialize_gui, but the session timer
+        # thread may call back before that, so they start out as None
+        self.timer_progress = None
+        self.elapsed_label = None
+        self.distraction_label = None
+        # The preview label lives in the dashboard; frames can be delivered
+        # before it is built
+        self.camera_label = None
         
         # Set up callbacks
         self.setup_callbacks()
@@ -80,21 +309,61 @@ class ModernStudyFocusGUI:
         
         # Get theme colors
         self.colors = self.config_manager.get_theme_colors()
+        self._active_theme = self.config_manager.get("theme.mode")
         self.root.configure(bg=self.colors["bg"])
         
+        # Shared fonts - created once and referenced by every widget
+        self.fonts = {
+            'display': tkfont.Font(family="Arial", size=48, weight="bold"),
+            'h1': tkfont.Font(family="Arial", size=32, weight="bold"),
+            'h2': tkfont.Font(family="Arial", size=28, weight="bold"),
+            'h3': tkfont.Font(family="Arial", size=24, weight="bold"),
+            'h4': tkfont.Font(family="Arial", size=18, weight="bold"),
+            'title': tkfont.Font(family="Arial", size=16, weight="bold"),
+            'subtitle': tkfont.Font(family="Arial", size=16),
+            'card_title': tkfont.Font(family="Arial", size=14, weight="bold"),
+            'label_bold': tkfont.Font(family="Arial", size=13, weight="bold"),
+            'body_large_bold': tkfont.Font(family="Arial", size=12, weight="bold"),
+            'body_large': tkfont.Font(family="Arial", size=12),
+            'body_bold': tkfont.Font(family="Arial", size=11, weight="bold"),
+            'body_italic': tkfont.Font(family="Arial", size=11, slant="italic"),
+            'body': tkfont.Font(family="Arial", size=11),
+            'small_italic': tkfont.Font(family="Arial", size=10, slant="italic"),
+            'small': tkfont.Font(family="Arial", size=10),
+            'tiny': tkfont.Font(family="Arial", size=9),
+            'mono': tkfont.Font(family="Consolas", size=10),
+        }
+        
+        # ttk styles - the platform theme stays in use for every other widget;
+        # only the sidebar buttons borrow clam's border, which honours
+        # background colors on every platform
+        self.style = ttk.Style(self.root)
+        self.style.element_create("Nav.Button.border", "from", "clam", "Button.border")
+        nav_layout = [("Nav.Button.border", {"sticky": "nswe", "children": [
+            ("Button.padding", {"sticky": "nswe", "children": [
+                ("Button.label", {"sticky": "nswe"})]})]})]
+        self.style.layout("Nav.TButton", nav_layout)
+        self.style.layout("NavActive.TButton", nav_layout)
+        self.configure_nav_styles()
+        
         # Initialize animation engine
         self.animation_engine = AnimationEngine(self.root)
         
         # Create main layout
         self.create_modern_layout()
+        self.root.after(200, self._ui_tick)
         
         # Initialize camera with config index
         camera_index = self.config_manager.get("camera.device_index", 0)
+        self._active_camera_index = camera_index
         if self.focus_tracker.initialize_camera(camera_index):
             self.show_toast("Camera initialized successfully")
         else:
             self.show_toast("Warning: Camera not available")
         
+        # Decode the alert sound now rather than on the first distraction
+        self.sound_manager.preload("distraction_alert")
+        
         # Set focus tracking sensitivity from config
         sensitivity = self.config_manager.get("focus_tracking.sensitivity", "medium")
         self.focus_tracker.set_sensitivity(sensitivity)
@@ -102,8 +371,6 @@ class ModernStudyFocusGUI:
         # Set face outline visibility from config
         show_outline = self.config_manager.get("focus_tracking.show_outline", True)
         self.focus_tracker.set_show_outline(show_outline)
-            
-        self.running = True
         
     def create_modern_layout(self):
         """Create the modern sidebar + content area layout."""
@@ -111,47 +378,53 @@ class ModernStudyFocusGUI:
         main_container = tk.Frame(self.root, bg=self.colors["bg"])
         main_container.pack(fill=tk.BOTH, expand=True)
         
+        # Fixed-width sidebar column, content column takes the rest
+        main_container.columnconfigure(0, weight=0, minsize=250)
+        main_container.columnconfigure(1, weight=1)
+        main_container.rowconfigure(0, weight=1)
+        
         # Sidebar
         self.create_sidebar(main_container)
         
         # Content area
         self.content_area = tk.Frame(main_container, bg=self.colors["bg"])
-        self.content_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.content_area.grid(row=0, column=1, sticky="nsew")
+        # Every view sits in the same cell; show_view raises the one to show
+        self.content_area.rowconfigure(0, weight=1)
+        self.content_area.columnconfigure(0, weight=1)
         
-        # Create all views
+        # Only the dashboard is built up front; the other views are
+        # created by show_view the first time they are opened
         self.create_dashboard_view()
-        self.create_materials_view()
-        self.create_analytics_view()
-        self.create_settings_view()
         
         # Show dashboard by default
-        self.show_view("dashboard")
+        self.views["dashboard"].grid(row=0, column=0, sticky="nsew")
         
     def create_sidebar(self, parent):
         """Create modern sidebar navigation."""
-        sidebar = tk.Frame(parent, bg=self.colors["bg_secondary"], width=250)
-        sidebar.pack(side=tk.LEFT, fill=tk.Y)
-        sidebar.pack_propagate(False)
+        bg2, fg2, accent = self.colors["bg_secondary"], self.colors["fg_secondary"], self.colors["accent_primary"]
+        
+        sidebar = tk.Frame(parent, bg=bg2)
+        sidebar.grid(row=0, column=0, sticky="nsew")
         
         # App title/logo
-        title_frame = tk.Frame(sidebar, bg=self.colors["bg_secondary"], height=100)
-        title_frame.pack(fill=tk.X, pady=20)
-        title_frame.pack_propagate(False)
+        title_frame = tk.Frame(sidebar, bg=bg2)
+        title_frame.pack(fill=tk.X, pady=20, ipady=10)
         
         app_title = tk.Label(title_frame, text="Study Focus", 
-                            bg=self.colors["bg_secondary"],
-                            fg=self.colors["accent_primary"],
-                            font=("Arial", 24, "bold"))
+                            bg=bg2,
+                            fg=accent,
+                            font=self.fonts['h3'])
         app_title.pack(pady=10)
         
         subtitle = tk.Label(title_frame, text="Eye Tracking Assistant", 
-                           bg=self.colors["bg_secondary"],
-                           fg=self.colors["fg_secondary"],
-                           font=("Arial", 10))
+                           bg=bg2,
+                           fg=fg2,
+                           font=self.fonts['small'])
         subtitle.pack()
         
         # Navigation buttons
-        nav_frame = tk.Frame(sidebar, bg=self.colors["bg_secondary"])
+        nav_frame = tk.Frame(sidebar, bg=bg2)
         nav_frame.pack(fill=tk.BOTH, expand=True, pady=20)
         
         nav_items = [
@@ -164,53 +437,55 @@ class ModernStudyFocusGUI:
         for label, view_name in nav_items:
             self.create_nav_button(nav_frame, label, view_name)
         
+    def configure_nav_styles(self):
+        """Configure sidebar button styles for the current theme colors."""
+        common = {"font": self.fonts['body_large'], "padding": (20, 15),
+                  "borderwidth": 0, "relief": "flat"}
+        
+        # Hover is handled by the style map inside Tk, no Python callbacks
+        self.style.configure("Nav.TButton", background=self.colors["bg_secondary"],
+                             foreground=self.colors["fg"], **common)
+        self.style.map("Nav.TButton",
+                       background=[("active", self.colors["button_hover"]),
+                                   ("!active", self.colors["bg_secondary"])])
+        
+        common["font"] = self.fonts['body_large_bold']
+        self.style.configure("NavActive.TButton", background=self.colors["accent_primary"],
+                             foreground=self.colors["bg"], **common)
+        self.style.map("NavActive.TButton",
+                       background=[("active", self.colors["accent_primary"])])
+        
     def create_nav_button(self, parent, text: str, view_name: str):
         """Create a navigation button."""
         btn_frame = tk.Frame(parent, bg=self.colors["bg_secondary"])
         btn_frame.pack(fill=tk.X, padx=15, pady=5)
         
         is_active = view_name == self.current_view
-        bg = self.colors["accent_primary"] if is_active else self.colors["bg_secondary"]
-        fg = self.colors["bg"] if is_active else self.colors["fg"]
-        
-        btn = tk.Label(btn_frame, text=text, bg=bg, fg=fg,
-                      font=("Arial", 12, "bold" if is_active else "normal"),
-                      cursor="hand2", padx=20, pady=15)
+        btn = ttk.Button(btn_frame, text=text, cursor="hand2", takefocus=False,
+                         style="NavActive.TButton" if is_active else "Nav.TButton",
+                         command=lambda: self.show_view(view_name))
         btn.pack(fill=tk.X)
         
         # Store reference
         self.sidebar_buttons[view_name] = btn
-        
-        # Bind click
-        btn.bind("<Button-1>", lambda e: self.show_view(view_name))
-        
-        # Hover effect
-        if not is_active:
-            btn.bind("<Enter>", lambda e: btn.config(bg=self.colors["button_hover"]))
-            btn.bind("<Leave>", lambda e: btn.config(bg=self.colors["bg_secondary"]))
     
     def show_view(self, view_name: str):
         """Switch to a different view with animation."""
         if view_name == self.current_view:
             return
         
-        # Update sidebar buttons
-        for name, btn in self.sidebar_buttons.items():
-            if name == view_name:
-                btn.config(bg=self.colors["accent_primary"], 
-                          fg=self.colors["bg"],
-                          font=("Arial", 12, "bold"))
-            else:
-                btn.config(bg=self.colors["bg_secondary"], 
-                          fg=self.colors["fg"],
-                          font=("Arial", 12, "normal"))
+        # Update sidebar buttons - only the old and new active ones change
+        self.sidebar_buttons[self.current_view].configure(style="Nav.TButton")
+        self.sidebar_buttons[view_name].configure(style="NavActive.TButton")
         
-        # Hide all views
-        for view in self.views.values():
-            view.pack_forget()
+        # Build the view on first visit
+        if view_name not in self.views:
+            getattr(self, f"create_{view_name}_view")()
+            self.views[view_name].grid(row=0, column=0, sticky="nsew")
         
-        # Show selected view
-        self.views[view_name].pack(fill=tk.BOTH, expand=True)
+        # Views stay gridded, so switching is a stacking change with no
+        # geometry pass over the content area
+        self.views[view_name].lift()
         self.current_view = view_name
         
     def create_dashboard_view(self):
@@ -219,14 +494,14 @@ class ModernStudyFocusGUI:
         self.views["dashboard"] = dashboard
         
         # Scrollable container
-        canvas = tk.Canvas(dashboard, bg=self.colors["bg"], highlightthickness=0)
+        canvas = tk.Canvas(dashboard, bg=self.colors["bg"], highlightthickness=0,
+                           yscrollincrement=20)
         scrollbar = ttk.Scrollbar(dashboard, orient="vertical", command=canvas.yview)
         scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
+        self.dashboard_canvas = canvas
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Every card resize fires <Configure>; set the scrollregion from the frame's reported size once per idle
+        scrollable_frame.bind("<Configure>", self._queue_dashboard_scrollregion)
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
@@ -236,7 +511,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=40, pady=30)
         
         title = tk.Label(header, text="Dashboard", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 32, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h1'])
         title.pack(side=tk.LEFT)
         
         # Session Status Banner
@@ -245,34 +520,36 @@ class ModernStudyFocusGUI:
         # Stats Cards Row
         stats_container = tk.Frame(scrollable_frame, bg=self.colors["bg"])
         stats_container.pack(fill=tk.X, padx=40, pady=20)
+        stats_container.rowconfigure(0, weight=1)
         
-        # Create stat cards
+        # Create stat cards - three equal grid columns
         self.stat_sessions = StatCard(stats_container, "Total Sessions", "0",
                                       bg_color=self.colors["card_bg"])
-        self.stat_sessions.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
-        
         self.stat_time = StatCard(stats_container, "Study Time", "0h 0m",
                                  bg_color=self.colors["card_bg"])
-        self.stat_time.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
-        
         self.stat_focus = StatCard(stats_container, "Focus Score", "0%",
                                   bg_color=self.colors["card_bg"])
-        self.stat_focus.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+        for col, stat in enumerate((self.stat_sessions, self.stat_time, self.stat_focus)):
+            stats_container.columnconfigure(col, weight=1, uniform="stat")
+            stat.grid(row=0, column=col, sticky="nsew", padx=10)
         
         # Main content: Two columns
         main_content = tk.Frame(scrollable_frame, bg=self.colors["bg"])
         main_content.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        main_content.columnconfigure(0, weight=1, uniform="col")
+        main_content.columnconfigure(1, weight=1, uniform="col")
+        main_content.rowconfigure(0, weight=1)
         
         # Left column - Session controls
         left_col = tk.Frame(main_content, bg=self.colors["bg"])
-        left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 20))
+        left_col.grid(row=0, column=0, sticky="nsew", padx=(0, 20))
         
         self.create_timer_card(left_col)
         self.create_focus_status_card(left_col)
         
         # Right column - Camera feed
         right_col = tk.Frame(main_content, bg=self.colors["bg"])
-        right_col.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        right_col.grid(row=0, column=1, sticky="nsew")
         
         self.create_camera_card(right_col)
         
@@ -283,6 +560,38 @@ class ModernStudyFocusGUI:
         # Update stats
         self.update_dashboard_stats()
         
+    def _queue_dashboard_scrollregion(self, event):
+        """Schedule one scrollregion update for a burst of resize events."""
+        self._dashboard_extent = (event.width, event.height)
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.root.after_idle(self._apply_dashboard_scrollregion)
+            
+    def _on_list_configure(self, render, event):
+        """Remember a list canvas' new size and re-render it once at idle."""
+        self._canvas_sizes[event.widget] = (event.width, event.height)
+        self._after_idle_once(render)
+        
+    def _after_idle_once(self, func):
+        """Run func at the next idle point, once per burst of requests."""
+        if func in self._idle_pending:
+            return
+        self._idle_pending.add(func)
+        
+        def run():
+            self._idle_pending.discard(func)
+            func()
+        self.root.after_idle(run)
+        
+    def _apply_dashboard_scrollregion(self):
+        """Fit the dashboard scrollregion to its content."""
+        self._scrollregion_pending = False
+        # The content frame is the canvas' only item, anchored at 0,0, so its
+        # size from <Configure> is the bbox - no need to ask the canvas
+        if self._dashboard_extent != self._dashboard_scrollregion:
+            self._dashboard_scrollregion = self._dashboard_extent
+            self.dashboard_canvas.configure(scrollregion=(0, 0) + self._dashboard_extent)
+        
     def create_session_control_card(self, parent):
         """Create the main session control card."""
         card = tk.Frame(parent, bg=self.colors["card_bg"])
@@ -298,13 +607,13 @@ class ModernStudyFocusGUI:
         self.session_status_label = tk.Label(left, text="Ready to Study", 
                                             bg=self.colors["card_bg"],
                                             fg=self.colors["fg"],
-                                            font=("Arial", 24, "bold"))
+                                            font=self.fonts['h3'])
         self.session_status_label.pack(anchor=tk.W)
         
         self.session_subtitle = tk.Label(left, text="Start a new session to begin tracking", 
                                         bg=self.colors["card_bg"],
                                         fg=self.colors["fg_secondary"],
-                                        font=("Arial", 12))
+                                        font=self.fonts['body_large'])
         self.session_subtitle.pack(anchor=tk.W, pady=(5, 0))
         
         # Right: Action buttons
@@ -318,6 +627,7 @@ class ModernStudyFocusGUI:
                                              text_color="#FFFFFF",
                                              hover_color=self.colors["accent_secondary"],
                                              corner_radius=14)
+        self._track_button(self.start_session_btn, "primary")
         self.start_session_btn.config(bg=self.colors["card_bg"])
         self.start_session_btn.pack(side=tk.LEFT, padx=5)
         
@@ -328,6 +638,7 @@ class ModernStudyFocusGUI:
                                              text_color="#FFFFFF",
                                              hover_color="#94A3B8",
                                              corner_radius=14)
+        self._track_button(self.pause_session_btn, "muted")
         self.pause_session_btn.config(bg=self.colors["card_bg"], state=tk.DISABLED)
         self.pause_session_btn.pack(side=tk.LEFT, padx=5)
         
@@ -338,123 +649,136 @@ class ModernStudyFocusGUI:
                                            text_color="#FFFFFF",
                                            hover_color="#DC2626",
                                            corner_radius=14)
+        self._track_button(self.end_session_btn, "danger")
         self.end_session_btn.config(bg=self.colors["card_bg"], state=tk.DISABLED)
         self.end_session_btn.pack(side=tk.LEFT, padx=5)
         
     def create_timer_card(self, parent):
         """Create timer display card with circular progress."""
-        card = tk.Frame(parent, bg=self.colors["card_bg"])
+        colors = self.colors
+        card_bg, bg2, accent = colors["card_bg"], colors["bg_secondary"], colors["accent_primary"]
+        fg, fg2 = colors["fg"], colors["fg_secondary"]
+        input_bg, input_fg = colors["input_bg"], colors["input_fg"]
+        
+        card = tk.Frame(parent, bg=card_bg)
         card.pack(fill=tk.X, pady=(0, 20))
         
         # Header
-        header = tk.Frame(card, bg=self.colors["card_bg"])
+        header = tk.Frame(card, bg=card_bg)
         header.pack(fill=tk.X, padx=30, pady=(20, 10))
         
-        tk.Label(header, text="Session Timer", bg=self.colors["card_bg"],
-                fg=self.colors["fg"], font=("Arial", 18, "bold")).pack(anchor=tk.W)
+        tk.Label(header, text="Session Timer", bg=card_bg,
+                fg=fg, font=self.fonts['h4']).pack(anchor=tk.W)
         
         # Duration setting
-        duration_frame = tk.Frame(card, bg=self.colors["card_bg"])
+        duration_frame = tk.Frame(card, bg=card_bg)
         duration_frame.pack(fill=tk.X, padx=30, pady=10)
         
-        tk.Label(duration_frame, text="Duration (minutes):", bg=self.colors["card_bg"],
-                fg=self.colors["fg_secondary"], font=("Arial", 11)).pack(side=tk.LEFT)
+        tk.Label(duration_frame, text="Duration (minutes):", bg=card_bg,
+                fg=fg2, font=self.fonts['body']).pack(side=tk.LEFT)
         
         self.duration_var = tk.StringVar(value=str(self.session_manager.settings["study_duration"]))
         duration_entry = tk.Entry(duration_frame, textvariable=self.duration_var,
-                                 bg=self.colors["input_bg"], fg=self.colors["input_fg"],
-                                 font=("Arial", 11), width=8, insertbackground=self.colors["fg"])
+                                 bg=input_bg, fg=input_fg,
+                                 font=self.fonts['body'], width=8, insertbackground=fg)
         duration_entry.pack(side=tk.LEFT, padx=10)
         
         # Circular progress
-        progress_frame = tk.Frame(card, bg=self.colors["card_bg"])
+        progress_frame = tk.Frame(card, bg=card_bg)
         progress_frame.pack(pady=30)
         
+        # The remaining time is drawn as the ring's own center text item
         self.timer_progress = CircularProgress(progress_frame, size=250, line_width=25,
-                                              color=self.colors["accent_primary"],
-                                              bg_color=self.colors["bg_secondary"])
-        self.timer_progress.config(bg=self.colors["card_bg"])
+                                              color=accent,
+                                              bg_color=bg2,
+                                              text_font=self.fonts['display'],
+                                              text_color=fg,
+                                              show_percent=False)
+        self.timer_progress.config(bg=card_bg)
+        self.timer_progress.set_text("00:00")
         self.timer_progress.pack()
         
-        # Time display overlay
-        self.timer_display = tk.Label(card, text="00:00", bg=self.colors["card_bg"],
-                                     fg=self.colors["fg"], font=("Arial", 48, "bold"))
-        self.timer_display.place(in_=self.timer_progress, relx=0.5, rely=0.5, anchor=tk.CENTER)
-        
         # Session stats
-        stats_frame = tk.Frame(card, bg=self.colors["card_bg"])
+        stats_frame = tk.Frame(card, bg=card_bg)
         stats_frame.pack(fill=tk.X, padx=30, pady=(10, 25))
         
-        left_stats = tk.Frame(stats_frame, bg=self.colors["card_bg"])
+        left_stats = tk.Frame(stats_frame, bg=card_bg)
         left_stats.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        self.elapsed_label = tk.Label(left_stats, text="Elapsed: 0:00", bg=self.colors["card_bg"],
-                                     fg=self.colors["fg_secondary"], font=("Arial", 11))
+        self.elapsed_label = tk.Label(left_stats, text="Elapsed: 0:00", bg=card_bg,
+                                     fg=fg2, font=self.fonts['body'])
         self.elapsed_label.pack(anchor=tk.W)
         
-        right_stats = tk.Frame(stats_frame, bg=self.colors["card_bg"])
+        right_stats = tk.Frame(stats_frame, bg=card_bg)
         right_stats.pack(side=tk.RIGHT, fill=tk.X, expand=True)
         
         self.distraction_label = tk.Label(right_stats, text="Distractions: 0", 
-                                         bg=self.colors["card_bg"],
-                                         fg=self.colors["fg_secondary"], font=("Arial", 11))
+                                         bg=card_bg,
+                                         fg=fg2, font=self.fonts['body'])
         self.distraction_label.pack(anchor=tk.E)
         
     def create_focus_status_card(self, parent):
         """Create live focus status indicator."""
-        card = tk.Frame(parent, bg=self.colors["card_bg"])
+        card_bg, fg, fg2 = self.colors["card_bg"], self.colors["fg"], self.colors["fg_secondary"]
+        fg_muted = self.colors["fg_muted"]
+        
+        card = tk.Frame(parent, bg=card_bg)
         card.pack(fill=tk.X, pady=(0, 20))
         
         # Header
-        header = tk.Frame(card, bg=self.colors["card_bg"])
+        header = tk.Frame(card, bg=card_bg)
         header.pack(fill=tk.X, padx=30, pady=(20, 10))
         
-        tk.Label(header, text="Focus Status", bg=self.colors["card_bg"],
-                fg=self.colors["fg"], font=("Arial", 18, "bold")).pack(anchor=tk.W)
+        tk.Label(header, text="Focus Status", bg=card_bg,
+                fg=fg, font=self.fonts['h4']).pack(anchor=tk.W)
         
         # Status indicator
-        status_frame = tk.Frame(card, bg=self.colors["card_bg"])
+        status_frame = tk.Frame(card, bg=card_bg)
         status_frame.pack(pady=30)
         
         self.focus_indicator = tk.Canvas(status_frame, width=120, height=120,
-                                        bg=self.colors["card_bg"], highlightthickness=0)
+                                        bg=card_bg, highlightthickness=0)
         self.focus_indicator.pack()
         
         # Draw circle
         self.focus_circle = self.focus_indicator.create_oval(10, 10, 110, 110,
-                                                             fill=self.colors["fg_muted"],
+                                                             fill=fg_muted,
                                                              outline="")
         
         # Status text
-        self.focus_status_text = tk.Label(card, text="Not Tracking", bg=self.colors["card_bg"],
-                                         fg=self.colors["fg"], font=("Arial", 16, "bold"))
+        self.focus_status_text = tk.Label(card, text="Not Tracking", bg=card_bg,
+                                         fg=fg, font=self.fonts['title'])
         self.focus_status_text.pack(pady=(10, 20))
         
         # Focus score
-        self.focus_score_label = tk.Label(card, text="Focus Score: --", bg=self.colors["card_bg"],
-                                         fg=self.colors["fg_secondary"], font=("Arial", 12))
+        self.focus_score_label = tk.Label(card, text="Focus Score: --", bg=card_bg,
+                                         fg=fg2, font=self.fonts['body_large'])
         self.focus_score_label.pack(pady=(0, 25))
         
     def create_camera_card(self, parent):
         """Create camera feed display."""
-        card = tk.Frame(parent, bg=self.colors["card_bg"])
+        card_bg, bg2, fg = self.colors["card_bg"], self.colors["bg_secondary"], self.colors["fg"]
+        fg_muted = self.colors["fg_muted"]
+        
+        card = tk.Frame(parent, bg=card_bg)
         card.pack(fill=tk.BOTH, expand=True)
         
         # Header
-        header = tk.Frame(card, bg=self.colors["card_bg"])
+        header = tk.Frame(card, bg=card_bg)
         header.pack(fill=tk.X, padx=30, pady=(20, 10))
         
-        tk.Label(header, text="Camera Feed", bg=self.colors["card_bg"],
-                fg=self.colors["fg"], font=("Arial", 18, "bold")).pack(anchor=tk.W)
+        tk.Label(header, text="Camera Feed", bg=card_bg,
+                fg=fg, font=self.fonts['h4']).pack(anchor=tk.W)
         
         # Camera display
-        camera_container = tk.Frame(card, bg=self.colors["bg_secondary"])
+        camera_container = tk.Frame(card, bg=bg2)
         camera_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=(10, 25))
         
         self.camera_label = tk.Label(camera_container, text="Camera feed will appear here\nwhen session starts",
-                                     bg=self.colors["bg_secondary"], fg=self.colors["fg_muted"],
-                                     font=("Arial", 12), justify=tk.CENTER)
+                                     bg=bg2, fg=fg_muted,
+                                     font=self.fonts['body_large'], justify=tk.CENTER)
         self.camera_label.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.camera_label.bind("<Configure>", self._on_camera_label_configure)
         
     def create_materials_view(self):
         """Create study materials view with AI assistant."""
@@ -474,7 +798,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=40, pady=30)
         
         title = tk.Label(header, text="Study Materials", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 32, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h1'])
         title.pack(side=tk.LEFT)
         
         add_btn = ModernButton(header, text="Add Link", command=self.add_link,
@@ -482,72 +806,151 @@ class ModernStudyFocusGUI:
                               bg_color=self.colors["accent_primary"],
                               text_color=self.colors["bg"],
                               hover_color=self.colors["accent_secondary"])
+        self._track_button(add_btn, "primary")
         add_btn.config(bg=self.colors["bg"])
         add_btn.pack(side=tk.RIGHT)
         
-        # Materials grid
-        self.materials_container = tk.Frame(links_tab, bg=self.colors["bg"])
-        self.materials_container.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+        # Materials grid - a canvas that only holds cards for visible rows
+        grid_frame = tk.Frame(links_tab, bg=self.colors["bg"])
+        grid_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
         
+        self.materials_canvas = tk.Canvas(grid_frame, bg=self.colors["bg"],
+                                          highlightthickness=0)
+        scrollbar = ttk.Scrollbar(grid_frame, orient="vertical",
+                                  command=self._on_materials_scroll)
+        self.materials_canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.materials_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.materials_canvas.bind("<Configure>",
+                                   partial(self._on_list_configure, self.render_visible_materials))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.root.bind_all(sequence, self._on_materials_wheel, add="+")
+        
+        self._card_pool = []
         self.load_materials()
         
         # Tab 2: AI Assistant
         ai_tab = tk.Frame(notebook, bg=self.colors["bg"])
         notebook.add(ai_tab, text="AI Assistant")
-        self.create_ai_assistant_tab(ai_tab)
         
         # Tab 3: Uploaded Materials
         uploads_tab = tk.Frame(notebook, bg=self.colors["bg"])
         notebook.add(uploads_tab, text="My Uploads")
-        self.create_uploads_tab(uploads_tab)
+        
+        # Like the views, the other tabs are built the first time they are shown
+        pending_tabs = {str(ai_tab): (self.create_ai_assistant_tab, ai_tab),
+                        str(uploads_tab): (self.create_uploads_tab, uploads_tab)}
+        
+        def on_tab_changed(e):
+            builder = pending_tabs.pop(notebook.select(), None)
+            if builder:
+                create_tab, tab = builder
+                create_tab(tab)
+        notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
         
     def load_materials(self):
         """Load and display study materials as cards."""
-        # Clear existing
-        for widget in self.materials_container.winfo_children():
-            widget.destroy()
-        
-        # Create grid
-        row = 0
-        col = 0
-        for idx, link in enumerate(self.materials_manager.materials["quick_links"]):
-            card = tk.Frame(self.materials_container, bg=self.colors["card_bg"])
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            
-            # Card content
-            content = tk.Frame(card, bg=self.colors["card_bg"])
-            content.pack(fill=tk.BOTH, expand=True, padx=25, pady=20)
-            
-            name_label = tk.Label(content, text=link['name'], bg=self.colors["card_bg"],
-                                 fg=self.colors["fg"], font=("Arial", 14, "bold"),
-                                 wraplength=250, justify=tk.LEFT)
-            name_label.pack(anchor=tk.W)
-            
-            url_label = tk.Label(content, text=link['url'], bg=self.colors["card_bg"],
-                                fg=self.colors["fg_secondary"], font=("Arial", 10),
-                                wraplength=250, justify=tk.LEFT)
-            url_label.pack(anchor=tk.W, pady=(5, 15))
-            
-            open_btn = ModernButton(content, text="Open", 
-                                   command=lambda l=link: self.materials_manager.open_quick_link(l["name"]),
-                                   width=100, height=35,
-                                   bg_color=self.colors["accent_primary"],
-                                   text_color=self.colors["bg"])
-            open_btn.config(bg=self.colors["card_bg"])
-            open_btn.pack(anchor=tk.W)
-            
-            # Hover effect
-            card.bind("<Enter>", lambda e, c=card: c.config(bg=self.colors["button_hover"]))
-            card.bind("<Leave>", lambda e, c=card: c.config(bg=self.colors["card_bg"]))
-            
-            col += 1
-            if col > 2:  # 3 columns
-                col = 0
-                row += 1
-        
-        # Configure grid
-        for i in range(3):
-            self.materials_container.columnconfigure(i, weight=1, minsize=300)
+        self.materials_canvas.yview_moveto(0)
+        self.render_visible_materials()
+        
+    def render_visible_materials(self):
+        """Show cards for the rows in view, recycling the pooled card widgets."""
+        canvas = self.materials_canvas
+        links = self.materials_manager.materials["quick_links"]
+        canvas_width, canvas_height = self._canvas_sizes.get(canvas, (1, 1))
+        width = max(canvas_width, MATERIAL_COLUMNS * 300)
+        col_width = width // MATERIAL_COLUMNS
+        text_width = col_width - 70  # card margin + content padding
+        
+        rows = -(-len(links) // MATERIAL_COLUMNS)
+        canvas.configure(scrollregion=(0, 0, width, rows * MATERIAL_ROW_HEIGHT))
+        
+        top = canvas.canvasy(0)
+        first_row = int(top // MATERIAL_ROW_HEIGHT)
+        last_row = int((top + canvas_height) // MATERIAL_ROW_HEIGHT)
+        first = first_row * MATERIAL_COLUMNS
+        last = min(len(links), (last_row + 1) * MATERIAL_COLUMNS)
+        
+        while len(self._card_pool) < last - first:
+            self._card_pool.append(self._create_material_card())
+            
+        for offset, slot in enumerate(self._card_pool):
+            idx = first + offset
+            if idx >= last:
+                canvas.itemconfigure(slot["item"], state="hidden")
+                continue
+            
+            link = links[idx]
+            if slot["link"] is not link or slot["width"] != text_width:
+                slot["name"].config(text=_elide(link['name'], self.fonts['card_title'], text_width))
+                slot["url"].config(text=_elide(link['url'], self.fonts['small'], text_width))
+                slot["link"] = link
+                slot["width"] = text_width
+                
+            row, col = divmod(idx, MATERIAL_COLUMNS)
+            canvas.coords(slot["item"], col * col_width + 10, row * MATERIAL_ROW_HEIGHT + 10)
+            canvas.itemconfigure(slot["item"], width=col_width - 20,
+                                 height=MATERIAL_ROW_HEIGHT - 20, state="normal")
+    
+    def _create_material_card(self) -> Dict[str, Any]:
+        """Create one reusable quick-link card; render_visible_materials fills it."""
+        card_bg, hover_bg = self.colors["card_bg"], self.colors["button_hover"]
+        
+        card = tk.Frame(self.materials_canvas, bg=card_bg)
+        slot = {"card": card, "link": None, "width": None}
+        slot["item"] = self.materials_canvas.create_window(0, 0, window=card, anchor="nw",
+                                                           state="hidden")
+        
+        # Card content
+        content = tk.Frame(card, bg=card_bg)
+        content.pack(fill=tk.BOTH, expand=True, padx=25, pady=20)
+        
+        slot["name"] = tk.Label(content, text="", bg=card_bg,
+                                fg=self.colors["fg"], font=self.fonts['card_title'])
+        slot["name"].pack(anchor=tk.W)
+        
+        slot["url"] = tk.Label(content, text="", bg=card_bg,
+                               fg=self.colors["fg_secondary"], font=self.fonts['small'])
+        slot["url"].pack(anchor=tk.W, pady=(5, 15))
+        
+        open_btn = ModernButton(content, text="Open", 
+                               command=lambda: self.materials_manager.open_quick_link(slot["link"]["name"]),
+                               width=100, height=35,
+                               bg_color=self.colors["accent_primary"],
+                               text_color=self.colors["bg"])
+        self._track_button(open_btn, "primary")
+        open_btn.config(bg=card_bg)
+        open_btn.pack(anchor=tk.W)
+        
+        # Hover effect - colors are bound now; the pool is rebuilt on theme change
+        card.bind("<Enter>", lambda e, c=card, bg=hover_bg: c.config(bg=bg))
+        card.bind("<Leave>", lambda e, c=card, bg=card_bg: c.config(bg=bg))
+        return slot
+        
+    def _reset_material_pool(self):
+        """Destroy the pooled cards so they are rebuilt with current colors."""
+        for slot in self._card_pool:
+            self.materials_canvas.delete(slot["item"])
+            slot["card"].destroy()
+        self._card_pool = []
+        self.render_visible_materials()
+    
+    def _on_materials_scroll(self, *args):
+        """Scrollbar command: move the canvas, then refill the visible rows."""
+        self.materials_canvas.yview(*args)
+        self._after_idle_once(self.render_visible_materials)
+        
+    def _on_materials_wheel(self, event):
+        """Scroll the materials grid with the mouse wheel when over it."""
+        # Cards are child windows, so check where the pointer actually is
+        widget = self.root.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.materials_canvas)):
+            return
+        if event.num == 4 or event.delta > 0:
+            self._on_materials_scroll("scroll", -1, "units")
+        else:
+            self._on_materials_scroll("scroll", 1, "units")
     
     def create_ai_assistant_tab(self, parent):
         """Create AI assistant interface."""
@@ -556,7 +959,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=30, pady=20)
         
         title = tk.Label(header, text="AI Study Assistant", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 28, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h2'])
         title.pack(side=tk.LEFT)
         
         # Button frame for Recent Chats and Clear
@@ -569,6 +972,7 @@ class ModernStudyFocusGUI:
                                  width=150, height=40,
                                  bg_color=self.colors["accent_secondary"],
                                  text_color=self.colors["bg"])
+        self._track_button(recent_btn, "default")
         recent_btn.config(bg=self.colors["bg"])
         recent_btn.pack(side=tk.LEFT, padx=5)
         
@@ -579,6 +983,7 @@ class ModernStudyFocusGUI:
                                 bg_color="#64748B",
                                 text_color="#FFFFFF",
                                 corner_radius=12)
+        self._track_button(clear_btn, "muted")
         clear_btn.config(bg=self.colors["bg"])
         clear_btn.pack(side=tk.LEFT, padx=5)
         
@@ -587,13 +992,13 @@ class ModernStudyFocusGUI:
             status_label = tk.Label(header, text="⚠️ AI Not Available", 
                                    bg=self.colors["bg"],
                                    fg="#ff6b6b",
-                                   font=("Arial", 11, "italic"))
+                                   font=self.fonts['body_italic'])
             status_label.pack(side=tk.RIGHT, padx=10)
         else:
             status_label = tk.Label(header, text="✓ AI Ready", 
                                    bg=self.colors["bg"],
                                    fg="#51cf66",
-                                   font=("Arial", 11))
+                                   font=self.fonts['body'])
             status_label.pack(side=tk.RIGHT, padx=10)
         
         # Chat container
@@ -608,7 +1013,7 @@ class ModernStudyFocusGUI:
             chat_frame, wrap=tk.WORD,
             bg=self.colors["input_bg"],
             fg=self.colors["input_fg"],
-            font=("Arial", 11),
+            font=self.fonts['body'],
             insertbackground=self.colors["fg"],
             relief=tk.FLAT, padx=15, pady=15,
             state=tk.DISABLED
@@ -617,10 +1022,13 @@ class ModernStudyFocusGUI:
         
         # Configure tags for styling
         self.chat_display.tag_config("question", foreground=self.colors["accent_primary"], 
-                                    font=("Arial", 11, "bold"))
+                                    font=self.fonts['body_bold'])
         self.chat_display.tag_config("answer", foreground=self.colors["fg"])
         self.chat_display.tag_config("system", foreground=self.colors["fg_secondary"], 
-                                    font=("Arial", 10, "italic"))
+                                    font=self.fonts['small_italic'])
+        self.chat_display.tag_config("load_older", underline=True)
+        self.chat_display.tag_bind("load_older", "<Button-1>",
+                                   lambda e: self.show_recent_chats())
         
         # Input area
         input_frame = tk.Frame(chat_container, bg=self.colors["card_bg"])
@@ -631,7 +1039,7 @@ class ModernStudyFocusGUI:
         mode_frame.pack(fill=tk.X, pady=(0, 10))
         
         tk.Label(mode_frame, text="Mode:", bg=self.colors["card_bg"],
-                fg=self.colors["fg"], font=("Arial", 10)).pack(side=tk.LEFT, padx=(0, 10))
+                fg=self.colors["fg"], font=self.fonts['small']).pack(side=tk.LEFT, padx=(0, 10))
         
         self.ai_mode_var = tk.StringVar(value="internet")
         
@@ -639,14 +1047,14 @@ class ModernStudyFocusGUI:
                                     variable=self.ai_mode_var, value="internet",
                                     bg=self.colors["card_bg"], fg=self.colors["fg"],
                                     selectcolor=self.colors["accent_primary"],
-                                    font=("Arial", 10))
+                                    font=self.fonts['small'])
         internet_rb.pack(side=tk.LEFT, padx=5)
         
         materials_rb = tk.Radiobutton(mode_frame, text="📚 My Materials Only", 
                                      variable=self.ai_mode_var, value="materials",
                                      bg=self.colors["card_bg"], fg=self.colors["fg"],
                                      selectcolor=self.colors["accent_primary"],
-                                     font=("Arial", 10))
+                                     font=self.fonts['small'])
         materials_rb.pack(side=tk.LEFT, padx=5)
         
         # Question input
@@ -657,7 +1065,7 @@ class ModernStudyFocusGUI:
             question_frame,
             bg=self.colors["input_bg"],
             fg=self.colors["input_fg"],
-            font=("Arial", 11),
+            font=self.fonts['body'],
             insertbackground=self.colors["fg"],
             relief=tk.FLAT
         )
@@ -671,6 +1079,7 @@ class ModernStudyFocusGUI:
                               bg_color=self.colors["accent_primary"],
                               text_color="#FFFFFF",
                               corner_radius=12)
+        self._track_button(ask_btn, "primary")
         ask_btn.config(bg=self.colors["card_bg"])
         ask_btn.pack(side=tk.RIGHT)
         
@@ -684,7 +1093,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=30, pady=20)
         
         title = tk.Label(header, text="My Study Materials", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 28, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h2'])
         title.pack(side=tk.LEFT)
         
         # Upload button
@@ -694,6 +1103,7 @@ class ModernStudyFocusGUI:
                                  bg_color=self.colors["accent_primary"],
                                  text_color="#FFFFFF",
                                  corner_radius=14)
+        self._track_button(upload_btn, "primary")
         upload_btn.config(bg=self.colors["bg"])
         upload_btn.pack(side=tk.RIGHT)
         
@@ -701,6 +1111,27 @@ class ModernStudyFocusGUI:
         self.uploads_container = tk.Frame(parent, bg=self.colors["bg"])
         self.uploads_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=(0, 20))
         
+        # Empty state, shown instead of the list when nothing is uploaded
+        self.uploads_empty = tk.Frame(self.uploads_container, bg=self.colors["card_bg"])
+        tk.Label(self.uploads_empty, text="📚 No materials uploaded yet",
+                bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
+                font=self.fonts['subtitle']).pack(expand=True)
+        
+        # Scrollable list - only the rows in view get a card
+        self.uploads_canvas = tk.Canvas(self.uploads_container, bg=self.colors["bg"], 
+                                        highlightthickness=0)
+        self.uploads_scrollbar = tk.Scrollbar(self.uploads_container, orient="vertical", 
+                                              command=self._on_uploads_scroll)
+        self.uploads_canvas.configure(yscrollcommand=self.uploads_scrollbar.set)
+        
+        self.uploads_canvas.bind("<Configure>",
+                                 partial(self._on_list_configure, self.render_visible_uploads))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.root.bind_all(sequence, self._on_uploads_wheel, add="+")
+        
+        self._uploads_model = []
+        self._upload_pool = []
+        
         # Load uploaded materials
         self.load_uploaded_materials()
     
@@ -710,6 +1141,11 @@ class ModernStudyFocusGUI:
         if not question:
             return
         
+        # One question at a time - the answer is appended below the "thinking" line
+        if self._ai_future is not None:
+            self.show_toast("Still answering the previous question...")
+            return
+        
         if not self.ai_assistant.is_configured():
             messagebox.showerror("AI Not Available", 
                                 "AI Assistant is not configured.\n\n"
@@ -719,74 +1155,153 @@ class ModernStudyFocusGUI:
         # Clear entry
         self.question_entry.delete(0, tk.END)
         
-        # Add question to chat
-        self.add_to_chat(f"You: {question}\n", "question")
-        
-        # Show loading
-        self.add_to_chat("AI is thinking...\n", "system")
+        # Add question to chat and show loading
+        self.add_chat_batch([(f"You: {question}\n", "question"),
+                             ("AI is thinking...\n", "system")])
+        # Marks follow edits elsewhere, so the answer can drop this line
+        # without searching the transcript
+        self.chat_display.mark_set("thinking_start", "end-2l")
+        self.chat_display.mark_set("thinking_end", "end-1l")
+        self.chat_display.mark_gravity("thinking_start", tk.LEFT)
+        self.chat_display.mark_gravity("thinking_end", tk.LEFT)
         
         # Get mode
         mode = self.ai_mode_var.get()
         
-        # Process in thread to avoid blocking GUI
-        def process_question():
-            result = self.ai_assistant.ask_question(question, mode=mode)
-            
-            # Update GUI from main thread
-            self.root.after(0, lambda: self.display_ai_response(result))
+        # Ask on a daemon thread; _poll_ai picks the answer up on the Tk thread
+        self._ai_future = Future()
+        threading.Thread(target=self._run_ai_question,
+                         args=(self._ai_future, question, mode), daemon=True).start()
+        self.root.after(50, self._poll_ai)
+        
+    def _run_ai_question(self, future, question, mode):
+        """Answer one question into future (runs on a daemon thread)."""
+        with self._ai_slots:
+            try:
+                future.set_result(self.ai_assistant.ask_question(question, mode=mode))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def _poll_ai(self):
+        """Show the pending AI answer once it is ready."""
+        future = self._ai_future
+        if future is None:
+            return
+        if not future.done():
+            self.root.after(50, self._poll_ai)
+            return
         
-        thread = threading.Thread(target=process_question, daemon=True)
-        thread.start()
+        self._ai_future = None
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self.display_ai_response(result)
     
     def display_ai_response(self, result):
         """Display AI response in chat."""
-        # Remove "thinking" message
-        self.chat_display.config(state=tk.NORMAL)
-        content = self.chat_display.get("1.0", tk.END)
-        lines = content.split('\n')
-        if lines and "thinking" in lines[-2].lower():
-            # Remove last two lines (thinking message + blank line)
-            self.chat_display.delete("end-3l", "end-1l")
+        # The answer was added to the history, so the sessions need regrouping
+        # and the history needs saving - batched with any answers that follow
+        self._sessions_cache_dirty = True
+        if self._history_flush_job is None:
+            self._history_flush_job = self.root.after(2000, self._flush_chat_history)
         
         if result.get("success"):
             answer = result.get("answer", "No response")
             mode_icon = "🌐" if result.get("mode") == "internet" else "📚"
-            
-            self.add_to_chat(f"{mode_icon} AI: {answer}\n\n", "answer")
+            parts = [(f"{mode_icon} AI: {answer}\n\n", "answer")]
             
             # Show info if no information found in materials
             if result.get("mode") == "materials" and not result.get("found_info"):
-                self.add_to_chat("💡 Tip: Upload study materials or switch to Internet mode for more information.\n\n", "system")
+                parts.append(("💡 Tip: Upload study materials or switch to Internet mode for more information.\n\n", "system"))
         else:
             error = result.get("error", "Unknown error")
-            self.add_to_chat(f"❌ Error: {error}\n\n", "system")
+            parts = [(f"❌ Error: {error}\n\n", "system")]
         
-        self.chat_display.config(state=tk.DISABLED)
-        self.chat_display.see(tk.END)
+        with self._writable():
+            # Remove "thinking" message
+            if "thinking_start" in self.chat_display.mark_names():
+                self.chat_display.delete("thinking_start", "thinking_end")
+                self.chat_display.mark_unset("thinking_start", "thinking_end")
+            
+            self._insert_chat(parts)
+        self._after_idle_once(self._scroll_chat_to_end)
     
+    def _flush_chat_history(self):
+        """Persist the answers collected since the last flush on the I/O pool."""
+        self._history_flush_job = None
+        self._history_flush_future = self._io_executor.submit(self.ai_assistant.flush_chat_history)
+        
+    def _flush_chat_history_now(self):
+        """Flush the chat history synchronously, after any pooled flush."""
+        if self._history_flush_job is not None:
+            self.root.after_cancel(self._history_flush_job)
+            self._history_flush_job = None
+        if self._history_flush_future is not None:
+            self._history_flush_future.result()
+            self._history_flush_future = None
+        self.ai_assistant.flush_chat_history()
+        
     def add_to_chat(self, text, tag):
         """Add text to chat display with styling."""
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.insert(tk.END, text, tag)
-        self.chat_display.config(state=tk.DISABLED)
+        self.add_chat_batch([(text, tag)])
+        
+    def add_chat_batch(self, parts):
+        """Add several (text, tag) pieces with one state flip and one scroll."""
+        with self._writable():
+            self._insert_chat(parts)
+        self._after_idle_once(self._scroll_chat_to_end)
+        
+    def _scroll_chat_to_end(self):
+        """Scroll the chat to its last line; queued once per burst of writes."""
         self.chat_display.see(tk.END)
+        
+    @contextmanager
+    def _writable(self):
+        """Unlock the read-only chat display for the duration of a block."""
+        self.chat_display.config(state=tk.NORMAL)
+        try:
+            yield self.chat_display
+        finally:
+            self.chat_display.config(state=tk.DISABLED)
+        
+    def _insert_chat(self, parts):
+        """Insert (text, tag) pieces in a single Text.insert call."""
+        args = []
+        for text, tag in parts:
+            args.extend((text, tag))
+        if args:
+            self.chat_display.insert(tk.END, *args)
+            self._trim_chat()
+            
+    def _trim_chat(self):
+        """Drop the oldest lines once the display grows past MAX_CHAT_LINES."""
+        lines = int(self.chat_display.index("end-1c").split(".")[0])
+        if lines <= MAX_CHAT_LINES:
+            return
+        
+        # The notice line is replaced, so it does not count as hidden text
+        removed = lines - MAX_CHAT_LINES + 1
+        self._truncated_lines += removed - (1 if self._truncated_lines else 0)
+        self.chat_display.delete("1.0", f"{removed + 1}.0")
+        self.chat_display.insert(
+            "1.0",
+            f"⬆ {self._truncated_lines} older lines hidden - click to open Recent Chats\n",
+            ("system", "load_older"))
     
     def load_chat_history(self):
         """Load and display chat history - starts fresh by default."""
-        # Clear chat display first
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.delete("1.0", tk.END)
-        self.chat_display.config(state=tk.DISABLED)
-        
         # Start with a fresh chat - no history loaded
+        self._flush_chat_history_now()
         self.ai_assistant.start_new_chat()
-        
-        # Show welcome message for fresh chat
-        self.add_to_chat("Welcome to AI Study Assistant! 👋\n\n", "system")
-        self.add_to_chat("You can ask me questions in two modes:\n", "system")
-        self.add_to_chat("🌐 Internet Mode: Get answers from the web\n", "system")
-        self.add_to_chat("📚 My Materials Mode: Get answers only from your uploaded study materials\n\n", "system")
-        self.add_to_chat("💡 Tip: Click '📜 Recent Chats' to view your previous conversations!\n\n", "system")
+        self._sessions_cache_dirty = True
+        self._truncated_lines = 0
+        
+        # Clear the display and show the welcome message in one write
+        with self._writable():
+            self.chat_display.delete("1.0", tk.END)
+            self.chat_display.insert(tk.END, WELCOME_TEXT, "system")
+        self._after_idle_once(self._scroll_chat_to_end)
     
     def start_new_chat(self):
         """Start a completely fresh chat."""
@@ -796,318 +1311,431 @@ class ModernStudyFocusGUI:
     
     def show_recent_chats(self):
         """Show popup with recent chat sessions."""
+        if not self._sessions_cache_dirty:
+            self._show_sessions_dialog(self._sessions_cache)
+            return
+        if self._sessions_future is not None:
+            return
+        
+        # Group the history off the Tk thread; an answer arriving meanwhile
+        # marks the cache dirty again for the next open
+        self._sessions_cache_dirty = False
+        self._sessions_future = self._io_executor.submit(self._load_chat_sessions)
+        self.root.config(cursor="watch")
+        self.root.after(20, self._poll_sessions)
+    
+    def _load_chat_sessions(self):
+        """Fetch the chat sessions with their dates formatted (worker thread)."""
         sessions = self.ai_assistant.get_chat_sessions()
+        for session in sessions:
+            _fmt_date(session, "start_time", SESSION_DATE_FMT, "Unknown date")
+        return sessions
+    
+    def _poll_sessions(self):
+        """Open the Recent Chats dialog once the sessions are grouped."""
+        future = self._sessions_future
+        if not future.done():
+            self.root.after(20, self._poll_sessions)
+            return
         
+        self._sessions_future = None
+        self.root.config(cursor="")
+        try:
+            self._sessions_cache = future.result()
+        except Exception as e:
+            print(f"Error loading chat sessions: {e}")
+            self._sessions_cache = []
+            self._sessions_cache_dirty = True
+        self._show_sessions_dialog(self._sessions_cache)
+    
+    def _show_sessions_dialog(self, sessions):
+        """Show the Recent Chats dialog for the given sessions."""
         if not sessions:
             messagebox.showinfo("Recent Chats", "No previous chat sessions found.")
             return
         
+        # The dialog is built once and hidden on close; reopening only
+        # refills the list when the sessions changed
+        dialog = self._recent_dialog
+        if dialog is None:
+            dialog = self._recent_dialog = self._build_sessions_dialog()
+        if self._recent_dialog_sessions is not sessions:
+            self._fill_sessions_text(sessions)
+        
+        dialog.deiconify()
+        dialog.grab_set()
+        
+        # Center dialog
+        dialog.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() - dialog.winfo_width()) // 2
+        y = self.root.winfo_y() + (self.root.winfo_height() - dialog.winfo_height()) // 2
+        dialog.geometry(f"+{x}+{y}")
+    
+    def _build_sessions_dialog(self):
+        """Create the (hidden) Recent Chats dialog."""
+        bg, fg = self.colors["bg"], self.colors["fg"]
+        
         # Create popup dialog
         dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.title("Recent Chat Sessions")
         dialog.geometry("700x500")
-        dialog.configure(bg=self.colors["bg"])
+        dialog.configure(bg=bg)
         dialog.transient(self.root)
-        dialog.grab_set()
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_sessions_dialog)
         
         # Header
-        header = tk.Frame(dialog, bg=self.colors["bg"])
+        header = tk.Frame(dialog, bg=bg)
         header.pack(fill=tk.X, padx=20, pady=20)
         
         tk.Label(header, text="Recent Chat Sessions", 
-                bg=self.colors["bg"], fg=self.colors["fg"],
-                font=("Arial", 18, "bold")).pack(side=tk.LEFT)
+                bg=bg, fg=fg,
+                font=self.fonts['h4']).pack(side=tk.LEFT)
         
         close_btn = ModernButton(header, text="✕", 
-                                command=dialog.destroy,
+                                command=self._hide_sessions_dialog,
                                 width=40, height=40,
                                 bg_color=self.colors["button_bg"],
-                                text_color=self.colors["fg"])
-        close_btn.config(bg=self.colors["bg"])
+                                text_color=fg)
+        close_btn.config(bg=bg)
         close_btn.pack(side=tk.RIGHT)
         
-        # Sessions list with scrollbar
-        list_container = tk.Frame(dialog, bg=self.colors["bg"])
+        # Sessions list - one Text widget, each session is a tagged block
+        list_container = tk.Frame(dialog, bg=bg)
         list_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
         
-        canvas = tk.Canvas(list_container, bg=self.colors["bg"], highlightthickness=0)
-        scrollbar = tk.Scrollbar(list_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Display each session as a card
-        for idx, session in enumerate(sessions):
-            self.create_session_card(scrollable_frame, session, idx, dialog)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        sessions_text = tk.Text(list_container, wrap=tk.WORD, cursor="hand2",
+                                bg=bg, fg=fg, relief=tk.FLAT, highlightthickness=0,
+                                spacing1=0, spacing3=0, padx=0, pady=0)
+        scrollbar = tk.Scrollbar(list_container, orient="vertical",
+                                 command=sessions_text.yview)
+        sessions_text.configure(yscrollcommand=scrollbar.set)
+        
+        sessions_text.tag_config("session", background=self.colors["card_bg"])
+        sessions_text.tag_config("date", font=self.fonts['body_large_bold'], foreground=fg,
+                                 lmargin1=20, lmargin2=20, spacing1=15)
+        sessions_text.tag_config("count", font=self.fonts['small'],
+                                 foreground=self.colors["fg_secondary"])
+        sessions_text.tag_config("preview", font=self.fonts['small'],
+                                 foreground=self.colors["fg_secondary"],
+                                 lmargin1=20, lmargin2=20, spacing1=5, spacing3=15)
+        sessions_text.tag_config("gap", font=self.fonts['tiny'])
+        
+        # Handlers live on the shared tag; the session_<idx> tag under the
+        # pointer says which session it is
+        hover_bg = self.colors["button_hover"]
+        sessions_text.tag_bind("session", "<Enter>",
+                               lambda e: self._highlight_session(hover_bg))
+        sessions_text.tag_bind("session", "<Leave>",
+                               lambda e: self._highlight_session(""))
+        sessions_text.tag_bind("session", "<Button-1>", self._on_session_click)
+        
+        sessions_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Center dialog
-        dialog.update_idletasks()
-        x = self.root.winfo_x() + (self.root.winfo_width() - dialog.winfo_width()) // 2
-        y = self.root.winfo_y() + (self.root.winfo_height() - dialog.winfo_height()) // 2
-        dialog.geometry(f"+{x}+{y}")
+        self._sessions_text = sessions_text
+        return dialog
     
-    def create_session_card(self, parent, session, idx, dialog):
-        """Create a card for a chat session."""
-        card = tk.Frame(parent, bg=self.colors["card_bg"], cursor="hand2")
-        card.pack(fill=tk.X, pady=8)
-        
-        content = tk.Frame(card, bg=self.colors["card_bg"])
-        content.pack(fill=tk.X, padx=20, pady=15)
-        
-        # Session info
-        try:
-            start_dt = datetime.fromisoformat(session["start_time"])
-            date_str = start_dt.strftime("%B %d, %Y at %I:%M %p")
-        except:
-            date_str = "Unknown date"
-        
-        # Date and message count
-        header = tk.Frame(content, bg=self.colors["card_bg"])
-        header.pack(fill=tk.X)
-        
-        date_label = tk.Label(header, text=date_str,
-                             bg=self.colors["card_bg"], fg=self.colors["fg"],
-                             font=("Arial", 12, "bold"), anchor=tk.W)
-        date_label.pack(side=tk.LEFT)
-        
-        count_label = tk.Label(header, text=f"{session['message_count']} messages",
-                              bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
-                              font=("Arial", 10))
-        count_label.pack(side=tk.RIGHT)
-        
-        # Preview
-        preview_label = tk.Label(content, text=session["preview"],
-                                bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
-                                font=("Arial", 10), anchor=tk.W, wraplength=600, justify=tk.LEFT)
-        preview_label.pack(fill=tk.X, pady=(5, 0))
-        
-        # Hover effect
-        def on_enter(e):
-            card.config(bg=self.colors["button_hover"])
-            content.config(bg=self.colors["button_hover"])
-            header.config(bg=self.colors["button_hover"])
-            date_label.config(bg=self.colors["button_hover"])
-            count_label.config(bg=self.colors["button_hover"])
-            preview_label.config(bg=self.colors["button_hover"])
-        
-        def on_leave(e):
-            card.config(bg=self.colors["card_bg"])
-            content.config(bg=self.colors["card_bg"])
-            header.config(bg=self.colors["card_bg"])
-            date_label.config(bg=self.colors["card_bg"])
-            count_label.config(bg=self.colors["card_bg"])
-            preview_label.config(bg=self.colors["card_bg"])
-        
-        def on_click(e):
-            self.load_chat_session(session["messages"])
-            dialog.destroy()
-            self.show_toast(f"Loaded chat from {date_str}")
-        
-        card.bind("<Enter>", on_enter)
-        card.bind("<Leave>", on_leave)
-        card.bind("<Button-1>", on_click)
-        content.bind("<Button-1>", on_click)
-        header.bind("<Button-1>", on_click)
-        date_label.bind("<Button-1>", on_click)
-        count_label.bind("<Button-1>", on_click)
-        preview_label.bind("<Button-1>", on_click)
+    def _fill_sessions_text(self, sessions):
+        """Replace the Recent Chats list with the given sessions."""
+        sessions_text = self._sessions_text
+        args = []
+        for idx, session in enumerate(sessions):
+            date_str = _fmt_date(session, "start_time", SESSION_DATE_FMT, "Unknown date")
+            block = ("session", f"session_{idx}")
+            args.extend((f"{date_str}    ", ("date",) + block,
+                         f"{session['message_count']} messages\n", ("count",) + block,
+                         f"{session['preview']}\n", ("preview",) + block,
+                         "\n", "gap"))
+        
+        sessions_text.config(state=tk.NORMAL)
+        sessions_text.delete("1.0", tk.END)
+        sessions_text.insert(tk.END, *args)
+        sessions_text.config(state=tk.DISABLED)
+        sessions_text.yview_moveto(0)
+        self._recent_dialog_sessions = sessions
+        self._hovered_session = None
+    
+    def _session_block_at_pointer(self):
+        """Return the session_<idx> tag under the mouse, if any."""
+        for tag in self._sessions_text.tag_names("current"):
+            if tag.startswith("session_"):
+                return tag
+        return None
+    
+    def _highlight_session(self, color):
+        """Set the hover background of the session under the mouse."""
+        if self._hovered_session:
+            self._sessions_text.tag_config(self._hovered_session, background="")
+        self._hovered_session = self._session_block_at_pointer() if color else None
+        if self._hovered_session:
+            self._sessions_text.tag_config(self._hovered_session, background=color)
+    
+    def _on_session_click(self, event):
+        """Load the session clicked in the Recent Chats dialog."""
+        block = self._session_block_at_pointer()
+        if block is None:
+            return
+        session = self._recent_dialog_sessions[int(block.split("_")[1])]
+        self.load_chat_session(session)
+        self._hide_sessions_dialog()
+        self.show_toast(f"Loaded chat from {_fmt_date(session, 'start_time', SESSION_DATE_FMT, 'Unknown date')}")
     
-    def load_chat_session(self, messages):
+    def _hide_sessions_dialog(self):
+        """Hide the Recent Chats dialog so the next open can reuse it."""
+        self._recent_dialog.grab_release()
+        self._recent_dialog.withdraw()
+    
+    def load_chat_session(self, session):
         """Load a specific chat session into the chat display."""
-        # Clear chat display
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.delete("1.0", tk.END)
-        
-        # Add header
-        self.add_to_chat("=== Loaded Previous Chat Session ===\n\n", "system")
-        
-        # Display all messages from the session
-        for item in messages:
-            question = item.get("question", "")
-            answer = item.get("answer", "")
-            mode = item.get("mode", "internet")
-            mode_icon = "🌐" if mode == "internet" else "📚"
-            
-            self.add_to_chat(f"You: {question}\n", "question")
-            self.add_to_chat(f"{mode_icon} AI: {answer}\n\n", "answer")
-        
-        self.add_to_chat("=== End of Previous Session ===\n", "system")
-        self.add_to_chat("💡 Continue the conversation or start a new chat!\n\n", "system")
-        
-        self.chat_display.config(state=tk.DISABLED)
-        self.chat_display.see(tk.END)
+        # The formatted transcript is kept on the session, so reopening
+        # it skips rebuilding the text
+        args = session.get("_transcript")
+        if args is None:
+            # Add header
+            args = ["=== Loaded Previous Chat Session ===\n\n", "system"]
+            
+            # Display all messages from the session
+            for item in session["messages"]:
+                question = item.get("question", "")
+                answer = item.get("answer", "")
+                mode = item.get("mode", "internet")
+                mode_icon = "🌐" if mode == "internet" else "📚"
+                
+                args.extend((f"You: {question}\n", "question",
+                             f"{mode_icon} AI: {answer}\n\n", "answer"))
+            
+            args.extend(("=== End of Previous Session ===\n"
+                         "💡 Continue the conversation or start a new chat!\n\n", "system"))
+            session["_transcript"] = args
+        
+        # Clear chat display, then put the whole history in with a single insert
+        self._truncated_lines = 0
+        with self._writable():
+            self.chat_display.delete("1.0", tk.END)
+            self.chat_display.insert(tk.END, *args)
+            self._trim_chat()
+        self._after_idle_once(self._scroll_chat_to_end)
     
     def upload_study_material(self):
         """Upload a new study material file."""
         file_path = filedialog.askopenfilename(
             title="Select Study Material",
-            filetypes=[
-                ("All Supported", "*.txt *.md *.pdf *.docx *.doc *.pptx *.ppt *.xlsx *.xls *.py *.java *.cpp *.js *.html *.css *.json"),
-                ("PDF Files", "*.pdf"),
-                ("Word Documents", "*.docx *.doc"),
-                ("PowerPoint", "*.pptx *.ppt"),
-                ("Excel Files", "*.xlsx *.xls"),
-                ("Text files", "*.txt"),
-                ("Markdown", "*.md"),
-                ("Code files", "*.py *.java *.cpp *.js *.html *.css *.json"),
-                ("All files", "*.*")
-            ]
+            filetypes=_UPLOAD_FILETYPES
         )
         
         if not file_path:
             return
         
-        # Ask for title and description
+        # Ask for title and description - the dialog is reused between uploads
+        if self._upload_dialog is None:
+            self._upload_dialog = self._build_upload_dialog()
+        self._upload_path = file_path
+        self._upload_title.delete(0, tk.END)
+        self._upload_title.insert(0, os.path.basename(file_path))
+        self._upload_desc.delete("1.0", tk.END)
+        
+        self._upload_dialog.deiconify()
+        self._upload_dialog.grab_set()
+        
+    def _build_upload_dialog(self):
+        """Create the (hidden) Material Details dialog."""
         dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.title("Material Details")
         dialog.geometry("400x250")
         dialog.configure(bg=self.colors["bg"])
         dialog.transient(self.root)
-        dialog.grab_set()
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_upload_dialog)
         
         tk.Label(dialog, text="Title:", bg=self.colors["bg"],
-                fg=self.colors["fg"], font=("Arial", 11)).pack(pady=(20, 5), padx=20, anchor=tk.W)
+                fg=self.colors["fg"], font=self.fonts['body']).pack(pady=(20, 5), padx=20, anchor=tk.W)
         
-        title_entry = tk.Entry(dialog, bg=self.colors["input_bg"],
-                              fg=self.colors["input_fg"], font=("Arial", 10))
-        title_entry.pack(pady=5, padx=20, fill=tk.X, ipady=5)
-        title_entry.insert(0, os.path.basename(file_path))
+        self._upload_title = tk.Entry(dialog, bg=self.colors["input_bg"],
+                                      fg=self.colors["input_fg"], font=self.fonts['small'])
+        self._upload_title.pack(pady=5, padx=20, fill=tk.X, ipady=5)
         
         tk.Label(dialog, text="Description (optional):", bg=self.colors["bg"],
-                fg=self.colors["fg"], font=("Arial", 11)).pack(pady=(10, 5), padx=20, anchor=tk.W)
-        
-        desc_text = tk.Text(dialog, bg=self.colors["input_bg"],
-                           fg=self.colors["input_fg"], font=("Arial", 10),
-                           height=4)
-        desc_text.pack(pady=5, padx=20, fill=tk.X)
+                fg=self.colors["fg"], font=self.fonts['body']).pack(pady=(10, 5), padx=20, anchor=tk.W)
         
-        def save_upload():
-            title = title_entry.get().strip()
-            description = desc_text.get("1.0", tk.END).strip()
-            
-            result = self.ai_assistant.upload_study_material(file_path, title, description)
-            
-            if result.get("success"):
-                messagebox.showinfo("Success", "Study material uploaded successfully!")
-                dialog.destroy()
-                self.load_uploaded_materials()
-            else:
-                messagebox.showerror("Error", f"Failed to upload: {result.get('error')}")
+        self._upload_desc = tk.Text(dialog, bg=self.colors["input_bg"],
+                                    fg=self.colors["input_fg"], font=self.fonts['small'],
+                                    height=4)
+        self._upload_desc.pack(pady=5, padx=20, fill=tk.X)
         
         btn_frame = tk.Frame(dialog, bg=self.colors["bg"])
         btn_frame.pack(pady=20)
         
-        save_btn = ModernButton(btn_frame, text="Upload", command=save_upload,
+        save_btn = ModernButton(btn_frame, text="Upload", command=self._save_upload,
                                width=100, height=35,
                                bg_color=self.colors["accent_primary"],
                                text_color=self.colors["bg"])
         save_btn.config(bg=self.colors["bg"])
         save_btn.pack(side=tk.LEFT, padx=5)
         
-        cancel_btn = ModernButton(btn_frame, text="Cancel", command=dialog.destroy,
+        cancel_btn = ModernButton(btn_frame, text="Cancel", command=self._hide_upload_dialog,
                                  width=100, height=35,
                                  bg_color=self.colors["button_hover"],
                                  text_color=self.colors["fg"])
         cancel_btn.config(bg=self.colors["bg"])
         cancel_btn.pack(side=tk.LEFT, padx=5)
+        return dialog
+    
+    def _save_upload(self):
+        """Upload the file picked for the Material Details dialog."""
+        title = self._upload_title.get().strip()
+        description = self._upload_desc.get("1.0", tk.END).strip()
+        
+        result = self.ai_assistant.upload_study_material(self._upload_path, title, description)
+        
+        if result.get("success"):
+            messagebox.showinfo("Success", "Study material uploaded successfully!")
+            self._hide_upload_dialog()
+            self._materials_cache_dirty = True
+            self.load_uploaded_materials()
+        else:
+            messagebox.showerror("Error", f"Failed to upload: {result.get('error')}")
+    
+    def _hide_upload_dialog(self):
+        """Hide the Material Details dialog so the next upload can reuse it."""
+        self._upload_dialog.grab_release()
+        self._upload_dialog.withdraw()
     
     def load_uploaded_materials(self):
         """Load and display uploaded materials."""
-        # Clear existing
-        for widget in self.uploads_container.winfo_children():
-            widget.destroy()
-        
-        materials = self.ai_assistant.get_uploaded_materials()
+        # The metadata files are only rescanned after an upload or delete
+        if self._materials_cache_dirty:
+            self._materials_cache = self.ai_assistant.get_uploaded_materials()
+            self._materials_cache_dirty = False
+        materials = self._materials_cache
+        self._uploads_model = materials
         
         if not materials:
             # Show empty state
-            empty_frame = tk.Frame(self.uploads_container, bg=self.colors["card_bg"])
-            empty_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-            
-            tk.Label(empty_frame, text="📚 No materials uploaded yet",
-                    bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
-                    font=("Arial", 16)).pack(expand=True)
+            self.uploads_canvas.pack_forget()
+            self.uploads_scrollbar.pack_forget()
+            self.uploads_empty.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
             return
         
-        # Create scrollable list
-        canvas = tk.Canvas(self.uploads_container, bg=self.colors["bg"], 
-                          highlightthickness=0)
-        scrollbar = tk.Scrollbar(self.uploads_container, orient="vertical", 
-                                command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        self.uploads_empty.pack_forget()
+        self.uploads_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.uploads_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.render_visible_uploads()
+    
+    def render_visible_uploads(self):
+        """Show cards for the uploads in view, recycling the pooled card widgets."""
+        canvas = self.uploads_canvas
+        materials = self._uploads_model
+        width, height = self._canvas_sizes.get(canvas, (1, 1))
+        canvas.configure(scrollregion=(0, 0, width, len(materials) * UPLOAD_ROW_HEIGHT))
+        
+        top = canvas.canvasy(0)
+        first = int(top // UPLOAD_ROW_HEIGHT)
+        last = min(len(materials), int((top + height) // UPLOAD_ROW_HEIGHT) + 1)
+        text_width = width - 60  # card margin + content padding
+        
+        while len(self._upload_pool) < last - first:
+            self._upload_pool.append(self._create_upload_card())
+            
+        for offset, slot in enumerate(self._upload_pool):
+            idx = first + offset
+            if idx >= last:
+                canvas.itemconfigure(slot["item"], state="hidden")
+                continue
+            
+            # Reloads return fresh dicts, so compare by content to keep
+            # cards whose material did not change
+            material = materials[idx]
+            if slot["sig"] != self._upload_signature(material) or slot["width"] != text_width:
+                self._fill_upload_card(slot, material, text_width)
+                
+            canvas.coords(slot["item"], 10, idx * UPLOAD_ROW_HEIGHT)
+            canvas.itemconfigure(slot["item"], width=max(width - 20, 0),
+                                 height=UPLOAD_ROW_HEIGHT - 10, state="normal")
+    
+    def _create_upload_card(self) -> Dict[str, Any]:
+        """Create one reusable uploaded-material card; _fill_upload_card fills it."""
+        card_bg, fg, fg2 = self.colors["card_bg"], self.colors["fg"], self.colors["fg_secondary"]
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        card = tk.Frame(self.uploads_canvas, bg=card_bg)
+        slot = {"card": card, "material": None, "sig": None, "width": None}
+        slot["item"] = self.uploads_canvas.create_window(0, 0, window=card, anchor="nw",
+                                                         state="hidden")
         
-        # Display materials as cards
-        for material in materials:
-            card = tk.Frame(scrollable_frame, bg=self.colors["card_bg"])
-            card.pack(fill=tk.X, padx=10, pady=5)
-            
-            content = tk.Frame(card, bg=self.colors["card_bg"])
-            content.pack(fill=tk.X, padx=20, pady=15)
-            
-            # Title
-            title_label = tk.Label(content, text=material.get("title", "Untitled"),
-                                  bg=self.colors["card_bg"], fg=self.colors["fg"],
-                                  font=("Arial", 13, "bold"), anchor=tk.W)
-            title_label.pack(fill=tk.X)
-            
-            # Metadata
-            word_count = material.get("word_count", 0)
-            upload_date = material.get("upload_date", "")
-            if upload_date:
-                try:
-                    date_obj = datetime.fromisoformat(upload_date)
-                    upload_date = date_obj.strftime("%Y-%m-%d %H:%M")
-                except:
-                    pass
-            
-            meta_text = f"📄 {word_count} words  •  📅 {upload_date}"
-            meta_label = tk.Label(content, text=meta_text,
-                                 bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
-                                 font=("Arial", 9), anchor=tk.W)
-            meta_label.pack(fill=tk.X, pady=(5, 0))
-            
-            # Description
-            if material.get("description"):
-                desc_label = tk.Label(content, text=material.get("description"),
-                                     bg=self.colors["card_bg"], fg=self.colors["fg_secondary"],
-                                     font=("Arial", 10), anchor=tk.W, wraplength=700, justify=tk.LEFT)
-                desc_label.pack(fill=tk.X, pady=(5, 10))
-            
-            # Delete button
-            file_id = os.path.basename(material.get("full_path", ""))
-            delete_btn = ModernButton(content, text="🗑️ Delete",
-                                     command=lambda fid=file_id: self.delete_material(fid),
-                                     width=100, height=30,
-                                     bg_color="#c44536",
-                                     text_color="white")
-            delete_btn.config(bg=self.colors["card_bg"])
-            delete_btn.pack(anchor=tk.W)
+        content = tk.Frame(card, bg=card_bg)
+        content.pack(fill=tk.X, padx=20, pady=15)
         
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Title
+        slot["title"] = tk.Label(content, text="",
+                                 bg=card_bg, fg=fg,
+                                 font=self.fonts['label_bold'], anchor=tk.W)
+        slot["title"].pack(fill=tk.X)
+        
+        # Metadata
+        slot["meta"] = tk.Label(content, text="",
+                                bg=card_bg, fg=fg2,
+                                font=self.fonts['tiny'], anchor=tk.W)
+        slot["meta"].pack(fill=tk.X, pady=(5, 0))
+        
+        # Description
+        slot["desc"] = tk.Label(content, text="",
+                                bg=card_bg, fg=fg2,
+                                font=self.fonts['small'], anchor=tk.W)
+        slot["desc"].pack(fill=tk.X, pady=(5, 10))
+        
+        # Delete button
+        delete_btn = ModernButton(content, text="🗑️ Delete",
+                                 command=lambda: self.delete_material(
+                                     os.path.basename(slot["material"].get("full_path", ""))),
+                                 width=100, height=30,
+                                 bg_color="#c44536",
+                                 text_color="white")
+        self._track_button(delete_btn, "danger")
+        delete_btn.config(bg=card_bg)
+        delete_btn.pack(anchor=tk.W)
+        return slot
+    
+    def _fill_upload_card(self, slot, material, text_width):
+        """Point a pooled upload card at another material."""
+        word_count = material.get("word_count", 0)
+        upload_date = _fmt_date(material, "upload_date", "%Y-%m-%d %H:%M")
+        
+        slot["title"].config(text=_elide(material.get("title") or "Untitled",
+                                         self.fonts['label_bold'], text_width))
+        slot["meta"].config(text=f"📄 {word_count} words  •  📅 {upload_date}")
+        slot["desc"].config(text=_elide(material.get("description") or "",
+                                        self.fonts['small'], text_width))
+        slot["material"] = material
+        slot["sig"] = self._upload_signature(material)
+        slot["width"] = text_width
+    
+    @staticmethod
+    def _upload_signature(material):
+        """Fields shown on an upload card; equal signatures need no refill."""
+        return (material.get("full_path"), material.get("title"), material.get("description"),
+                material.get("word_count"), material.get("upload_date"))
+    
+    def _on_uploads_scroll(self, *args):
+        """Scrollbar command: move the uploads canvas, then refill the visible rows."""
+        self.uploads_canvas.yview(*args)
+        self._after_idle_once(self.render_visible_uploads)
+        
+    def _on_uploads_wheel(self, event):
+        """Scroll the uploads list with the mouse wheel when over it."""
+        widget = self.root.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.uploads_canvas)):
+            return
+        if event.num == 4 or event.delta > 0:
+            self._on_uploads_scroll("scroll", -1, "units")
+        else:
+            self._on_uploads_scroll("scroll", 1, "units")
     
     def delete_material(self, file_id):
         """Delete an uploaded material."""
         if messagebox.askyesno("Confirm Delete", 
                               "Are you sure you want to delete this material?"):
             if self.ai_assistant.delete_uploaded_material(file_id):
+                self._materials_cache_dirty = True
                 self.load_uploaded_materials()
                 messagebox.showinfo("Success", "Material deleted successfully!")
             else:
@@ -1123,7 +1751,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=40, pady=30)
         
         title = tk.Label(header, text="Analytics", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 32, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h1'])
         title.pack(side=tk.LEFT)
         
         # Period selector
@@ -1131,7 +1759,7 @@ class ModernStudyFocusGUI:
         period_frame.pack(side=tk.RIGHT)
         
         tk.Label(period_frame, text="Period:", bg=self.colors["bg"],
-                fg=self.colors["fg_secondary"], font=("Arial", 11)).pack(side=tk.LEFT, padx=5)
+                fg=self.colors["fg_secondary"], font=self.fonts['body']).pack(side=tk.LEFT, padx=5)
         
         self.report_period_var = tk.StringVar(value="7")
         period_options = ["1", "7", "14", "30"]
@@ -1150,7 +1778,7 @@ class ModernStudyFocusGUI:
         self.report_text = scrolledtext.ScrolledText(report_card, wrap=tk.WORD,
                                                     bg=self.colors["input_bg"],
                                                     fg=self.colors["input_fg"],
-                                                    font=("Consolas", 10),
+                                                    font=self.fonts['mono'],
                                                     insertbackground=self.colors["fg"],
                                                     relief=tk.FLAT, padx=20, pady=20)
         self.report_text.pack(fill=tk.BOTH, expand=True, padx=25, pady=25)
@@ -1168,7 +1796,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=40, pady=30)
         
         title = tk.Label(header, text="Settings", bg=self.colors["bg"],
-                        fg=self.colors["fg"], font=("Arial", 32, "bold"))
+                        fg=self.colors["fg"], font=self.fonts['h1'])
         title.pack(side=tk.LEFT)
         
         # Settings cards
@@ -1185,7 +1813,8 @@ class ModernStudyFocusGUI:
         
         # Camera
         self.create_setting_card(settings, "Camera", [
-            ("Device Index", "entry", "camera.device_index", None)
+            ("Device Index", "entry", "camera.device_index", None),
+            ("Preview FPS", "entry", "camera.preview_fps", 10)
         ])
         
         # Notifications
@@ -1204,6 +1833,7 @@ class ModernStudyFocusGUI:
                                bg_color=self.colors["accent_primary"],
                                text_color=self.colors["bg"],
                                hover_color=self.colors["accent_secondary"])
+        self._track_button(save_btn, "primary")
         save_btn.config(bg=self.colors["bg"])
         save_btn.pack()
         
@@ -1217,7 +1847,7 @@ class ModernStudyFocusGUI:
         header.pack(fill=tk.X, padx=30, pady=(20, 10))
         
         tk.Label(header, text=title, bg=self.colors["card_bg"],
-                fg=self.colors["fg"], font=("Arial", 16, "bold")).pack(anchor=tk.W)
+                fg=self.colors["fg"], font=self.fonts['title']).pack(anchor=tk.W)
         
         # Settings
         for label, widget_type, config_key, values in settings_list:
@@ -1225,7 +1855,7 @@ class ModernStudyFocusGUI:
             row.pack(fill=tk.X, padx=30, pady=10)
             
             tk.Label(row, text=label, bg=self.colors["card_bg"],
-                    fg=self.colors["fg_secondary"], font=("Arial", 11)).pack(side=tk.LEFT)
+                    fg=self.colors["fg_secondary"], font=self.fonts['body']).pack(side=tk.LEFT)
             
             if widget_type == "combobox":
                 var = tk.StringVar(value=str(self.config_manager.get(config_key)))
@@ -1234,7 +1864,8 @@ class ModernStudyFocusGUI:
                 combo.pack(side=tk.RIGHT)
                 setattr(self, f"setting_{config_key.replace('.', '_')}", var)
             elif widget_type == "entry":
-                var = tk.StringVar(value=str(self.config_manager.get(config_key)))
+                # For entries, values is the default for keys older configs lack
+                var = tk.StringVar(value=str(self.config_manager.get(config_key, values)))
                 entry = tk.Entry(row, textvariable=var, bg=self.colors["input_bg"],
                                fg=self.colors["input_fg"], width=15,
                                insertbackground=self.colors["fg"])
@@ -1246,6 +1877,10 @@ class ModernStudyFocusGUI:
                                       fg=self.colors["fg"], selectcolor=self.colors["input_bg"])
                 check.pack(side=tk.RIGHT)
                 setattr(self, f"setting_{config_key.replace('.', '_')}", var)
+            
+            # Mirror every edit into the in-memory config right away
+            var.trace_add('write', lambda *_, key=config_key, v=var:
+                          self._on_setting_changed(key, v))
         
         # Bottom padding
         tk.Frame(card, bg=self.colors["card_bg"], height=15).pack()
@@ -1279,7 +1914,7 @@ class ModernStudyFocusGUI:
             self.end_session_btn.config(state=tk.NORMAL)
             
             self.show_toast(f"Session started - {duration} minutes")
-            self.start_gui_update_thread()
+            self._start_analyzer()
             
     def pause_session(self):
         """Pause/resume session."""
@@ -1288,10 +1923,13 @@ class ModernStudyFocusGUI:
             
         if self.session_manager.paused:
             self.session_manager.resume_session()
+            self._start_analyzer()
             self.pause_session_btn.configure(text="Pause")
             self.show_toast("Session resumed")
         else:
             self.session_manager.pause_session()
+            # Nothing is analyzed during a break; resuming restarts the worker
+            self._stop_analyzer()
             self.pause_session_btn.configure(text="Resume")
             self.show_toast("Session paused")
             
@@ -1300,6 +1938,8 @@ class ModernStudyFocusGUI:
         if not self.session_active:
             return
             
+        self._stop_analyzer()
+        self._flush_focus_events()
         session_data = self.session_manager.end_session()
         self.focus_tracker.stop_tracking()
         self.session_active = False
@@ -1311,9 +1951,14 @@ class ModernStudyFocusGUI:
         self.pause_session_btn.config(state=tk.DISABLED, text="Pause")
         self.end_session_btn.config(state=tk.DISABLED)
         
-        # Reset displays
+        # Reset displays - drop any late timer update so it cannot undo this
+        with self._state_lock:
+            self._pending_state.clear()
+        self._status_text_key = None
+        self._last_state.pop('progress', None)
+        self._last_state['timer_text'] = "00:00"
         self.timer_progress.set_progress(0, animated=True)
-        self.timer_display.config(text="00:00")
+        self.timer_progress.set_text("00:00")
         
         self.show_toast("Session completed!")
         
@@ -1327,160 +1972,352 @@ class ModernStudyFocusGUI:
         if self.session_active:
             self.session_manager.log_distraction_event()
             
-            # Pulse focus indicator
-            if hasattr(self, 'focus_indicator'):
-                self.animation_engine.pulse(self.focus_indicator)
+            # Pulse focus indicator - done on the Tk thread by _poll_analysis
+            self._pulse_pending = True
+            
+            now = time.monotonic()
+            if now - self._last_alert_time < self._alert_throttle:
+                return
+            self._last_alert_time = now
             
-            if self.config_manager.get("notifications.sounds"):
-                self.sound_manager.play_sound("distraction_alert")
+            if self._sounds_enabled:
+                self._io_executor.submit(self.sound_manager.play_sound, "distraction_alert")
                 
-            if self.config_manager.get("notifications.enabled"):
-                self.notification_manager.show_notification(
+            if self._notifications_enabled:
+                self._io_executor.submit(
+                    self.notification_manager.show_notification,
                     "Focus Alert", 
                     "You seem distracted. Return to your studies!"
                 )
                 
     def on_session_end(self):
         """Handle automatic session end."""
-        self.end_session()
+        # Called from the session timer thread - end on the Tk thread
+        self.root.after(0, self.end_session)
         
     def on_session_update(self, status):
         """Handle session status updates."""
-        if hasattr(self, 'timer_display'):
-            remaining = status.get('remaining_time', 0)
-            self.timer_display.config(text=DataFormatter.format_time(remaining))
-            
-            # Update circular progress
-            total_duration = self.session_manager.settings["study_duration"] * 60
-            if total_duration > 0:
-                progress = ((total_duration - remaining) / total_duration) * 100
-                self.timer_progress.set_progress(progress, animated=False)
-            
-        if hasattr(self, 'elapsed_label'):
-            elapsed = status.get('elapsed_time', 0)
-            self.elapsed_label.config(text=f"Elapsed: {DataFormatter.format_time(elapsed)}")
-            
-        if hasattr(self, 'distraction_label'):
-            count = status.get('distraction_count', 0)
-            self.distraction_label.config(text=f"Distractions: {count}")
-            
-    def start_gui_update_thread(self):
-        """Start the GUI update thread."""
-        if not self.gui_update_thread or not self.gui_update_thread.is_alive():
-            self.gui_update_thread = threading.Thread(target=self.gui_update_loop)
-            self.gui_update_thread.daemon = True
-            self.gui_update_thread.start()
-            
-    def gui_update_loop(self):
-        """Main GUI update loop."""
-        while self.running and self.session_active:
+        # Called from the session timer thread - only record the new state,
+        # _ui_tick pushes it into the widgets
+        remaining = status.get('remaining_time', 0)
+        elapsed = status.get('elapsed_time', 0)
+        count = status.get('distraction_count', 0)
+        
+        # The texts only change once a second, so format them only then
+        state = {}
+        text_key = (int(remaining), int(elapsed), count)
+        if text_key != self._status_text_key:
+            self._status_text_key = text_key
+            state['timer_text'] = DataFormatter.format_time(remaining)
+            state['elapsed_text'] = f"Elapsed: {DataFormatter.format_time(elapsed)}"
+            state['distraction_text'] = f"Distractions: {count}"
+        
+        # Update circular progress
+        total_duration = self.session_manager.settings["study_duration"] * 60
+        if total_duration > 0:
+            state['progress'] = ((total_duration - remaining) / total_duration) * 100
+            
+        with self._state_lock:
+            self._pending_state.update(state)
+        
+    def _ui_tick(self):
+        """Apply pending dashboard state every 200 ms."""
+        try:
+            self._apply_pending_state()
+        finally:
+            # An unexpected error must not stop the dashboard for good
+            self.root.after(200, self._ui_tick)
+            
+    def _apply_pending_state(self):
+        """Push pending dashboard state into the widgets that changed."""
+        if self._focus_count != self._focus_count_shown:
+            self._focus_count_shown = self._focus_count
+            filled = min(self._focus_count, FOCUS_WINDOW)
+            score = float(self._focus_buf[:filled].mean())
+            with self._state_lock:
+                self._pending_state['focus_score_text'] = f"Focus Score: {score:.2f}"
+            
+        with self._state_lock:
+            pending, self._pending_state = self._pending_state, {}
+        
+        for key, value in pending.items():
+            if self._last_state.get(key) == value:
+                continue
             try:
-                if self.focus_tracker.camera and self.focus_tracker.is_tracking:
-                    frame, focus_data = self.focus_tracker.process_frame()
-                    if frame is not None and focus_data is not None:
-                        self.root.after(0, self.update_focus_display, focus_data)
-                        self.root.after(0, self.update_camera_feed, frame)
-                        
-                        self.session_manager.log_focus_event(
-                            focus_data['focus_score'], 
-                            focus_data['is_focused']
-                        )
-                        
-                time.sleep(0.1)
+                if key == 'timer_text' and self.timer_progress is not None:
+                    self.timer_progress.set_text(value)
+                elif key == 'progress' and self.timer_progress is not None:
+                    self.timer_progress.set_progress(value, animated=False)
+                elif key == 'elapsed_text' and self.elapsed_label is not None:
+                    self.elapsed_label.config(text=value)
+                elif key == 'distraction_text' and self.distraction_label is not None:
+                    self.distraction_label.config(text=value)
+                elif key == 'is_focused':
+                    status_key = "status_focused" if value else "status_distracted"
+                    self.focus_status_text.config(text="Focused" if value else "Distracted",
+                                                  fg=self.colors[status_key])
+                    self.focus_indicator.itemconfig(self.focus_circle,
+                                                    fill=self.colors[status_key])
+                elif key == 'focus_score_text':
+                    self.focus_score_label.config(text=value)
+                else:
+                    continue
+                self._last_state[key] = value
+            except tk.TclError:
+                pass
+        
+    def _start_analyzer(self):
+        """Start the capture/inference worker for the session."""
+        # Without a camera every job would return at once and the worker
+        # would just cycle for the whole session; the camera cannot change
+        # while a session is active, so it is enough to check here
+        if self._analyzer is None and self.focus_tracker.camera:
+            self._focus_count = self._focus_count_shown = 0
+            # Decode only as many frames as the analyzer will consume
+            self.focus_tracker.decode_fps = 1.0 / self._analysis_interval
+            self._analyzer = ThreadPoolExecutor(max_workers=1)
+            self._schedule_analysis()
+            
+    def _stop_analyzer(self):
+        """Stop scheduling frames and wait for the worker to finish."""
+        if self._analysis_job is not None:
+            self.root.after_cancel(self._analysis_job)
+            self._analysis_job = None
+        if self._analyzer is not None:
+            # The worker never calls into Tk, so blocking here cannot deadlock
+            self._analyzer.shutdown(wait=True)
+            self._analyzer = None
+            
+    def _schedule_analysis(self):
+        """Submit one capture+inference job to the worker."""
+        self._analysis_job = None
+        if not self.session_active or self._analyzer is None:
+            return
+        self._analysis_deadline = time.monotonic() + self._analysis_interval
+        future = self._analyzer.submit(self._analyze_frame)
+        # First look when the job usually finishes, then every 5 ms, so a
+        # frame costs a couple of Tk wakeups instead of one per 5 ms slice
+        first_poll_ms = max(5, int(self._analysis_cost * 900))
+        self._analysis_job = self.root.after(first_poll_ms, self._poll_analysis, future)
+        
+    def _analyze_frame(self):
+        """Grab, analyze and convert one camera frame (runs on the worker)."""
+        if not (self.focus_tracker.camera and self.focus_tracker.is_tracking):
+            return None, None
+        
+        frame, focus_data = self.focus_tracker.process_frame()
+        
+        # Focus samples are logged from here so the Tk thread never does it;
+        # end_session stops this worker before its final flush
+        if focus_data is not None:
+            self._focus_ring.append((
+                time.time(),
+                focus_data['focus_score'], 
+                focus_data['is_focused']
+            ))
+            if time.monotonic() - self._last_flush >= 1.0:
+                self._flush_focus_events()
+        
+        # Do the pixel work here so the Tk thread only pastes the result;
+        # the preview is only drawn while the dashboard is on screen
+        preview = None
+        if frame is not None and self.current_view == "dashboard":
+            preview = self._prepare_preview(frame)
+        return preview, focus_data
+        
+    def _poll_analysis(self, future):
+        """Push a finished frame into the UI and queue the next one."""
+        if not future.done():
+            self._analysis_job = self.root.after(5, self._poll_analysis, future)
+            return
+        self._analysis_job = None
+        started = self._analysis_deadline - self._analysis_interval
+        self._analysis_cost += 0.2 * (time.monotonic() - started - self._analysis_cost)
+        
+        try:
+            preview, focus_data = future.result()
+            # The worker already logged the sample; the preview is only drawn
+            # while the dashboard (which holds it) is on screen
+            if focus_data is not None and self.current_view == "dashboard":
+                self.update_focus_display(focus_data)
+                self.update_camera_feed(preview)
+                    
+            if self._pulse_pending:
+                self._pulse_pending = False
+                if self.current_view == "dashboard":
+                    self.animation_engine.pulse(self.focus_indicator)
                 
-            except Exception as e:
-                print(f"GUI update error: {e}")
-                import traceback
-                traceback.print_exc()
-                break
+        except Exception as e:
+            print(f"GUI update error: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+            
+        # Sleep only for what is left of the slot, so inference time does
+        # not stretch the cadence
+        delay_ms = int(max(0.0, self._analysis_deadline - time.monotonic()) * 1000)
+        self._analysis_job = self.root.after(delay_ms, self._schedule_analysis)
+        
+    def _flush_focus_events(self):
+        """Hand buffered focus samples to the session manager in one call."""
+        self._last_flush = time.monotonic()
+        batch = []
+        try:
+            while True:
+                batch.append(self._focus_ring.popleft())
+        except IndexError:
+            pass
+        if batch:
+            self.session_manager.log_focus_events_bulk(batch)
                 
     def update_focus_display(self, focus_data):
         """Update focus status display."""
-        if focus_data['is_focused']:
-            self.focus_status_text.config(text="Focused", 
-                                         fg=self.colors["status_focused"])
-            self.focus_indicator.itemconfig(self.focus_circle, 
-                                           fill=self.colors["status_focused"])
-        else:
-            self.focus_status_text.config(text="Distracted", 
-                                         fg=self.colors["status_distracted"])
-            self.focus_indicator.itemconfig(self.focus_circle, 
-                                           fill=self.colors["status_distracted"])
-            
-        self.focus_score_label.config(text=f"Focus Score: {focus_data['focus_score']:.2f}")
+        with self._state_lock:
+            self._pending_state['is_focused'] = bool(focus_data['is_focused'])
         
-    def update_camera_feed(self, frame):
+        # Just store the sample; _ui_tick averages and formats once per tick
+        self._focus_buf[self._focus_count % FOCUS_WINDOW] = focus_data['focus_score']
+        self._focus_count += 1
+        
+    def update_camera_feed(self, image):
         """Update camera feed display."""
+        if image is None or self.camera_label is None:
+            return
         try:
-            if frame is not None and hasattr(self, 'camera_label'):
-                # Convert from BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Resize frame to fit in the display area
-                display_height = 400
-                aspect_ratio = frame.shape[1] / frame.shape[0]
-                display_width = int(display_height * aspect_ratio)
-                
-                frame_resized = cv2.resize(frame_rgb, (display_width, display_height))
-                
-                # Convert to PIL Image
-                img = Image.fromarray(frame_resized)
-                
-                # Convert to ImageTk
-                imgtk = ImageTk.PhotoImage(image=img)
-                
-                # Update label
-                self.camera_label.configure(image=imgtk, text="")
-                self.camera_label.image = imgtk  # Keep a reference
-                
-        except Exception:
-            pass  # Suppress frequent frame errors for perf
+            self._render_frame(image)
+        except tk.TclError:
+            pass  # Label destroyed mid-frame (closing or theme rebuild)
+    
+    def _prepare_preview(self, frame_bgr):
+        """Scale and convert an annotated BGR frame to binary PPM data.
+        
+        Runs on the analyzer worker. The focus overlay is already drawn
+        onto the numpy frame by the tracker.
+        """
+        width, height = display_size = self._get_display_size(frame_bgr)
+        
+        # Output buffers are reused frame to frame. That is safe because the
+        # next frame is only submitted after _poll_analysis pasted this one.
+        if self._ppm_size != display_size:
+            header = b'P6\n%d %d\n255\n' % display_size
+            self._ppm_buf = bytearray(len(header) + width * height * 3)
+            self._ppm_buf[:len(header)] = header
+            self._ppm_pixels = np.frombuffer(self._ppm_buf, dtype=np.uint8,
+                                             offset=len(header)).reshape(height, width, 3)
+            self._resize_buf = np.empty((height, width, 3), dtype=np.uint8)
+            self._ppm_size = display_size
+        
+        # Shrink first so the color swap touches fewer bytes
+        if display_size != (frame_bgr.shape[1], frame_bgr.shape[0]):
+            frame_bgr = cv2.resize(frame_bgr, display_size, dst=self._resize_buf,
+                                   interpolation=cv2.INTER_AREA)
+        
+        # The RGB pixels are written straight behind the PPM header, so Tk
+        # can decode the data as is - no PIL image. Tcl only takes bytes
+        # (a bytearray would be passed as its repr), hence the one copy.
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._ppm_pixels)
+        return display_size, bytes(self._ppm_buf)
+        
+    def _render_frame(self, preview):
+        """Blit a prepared preview into the camera label.
+        
+        The only Tk work here is putting PPM data into one persistent
+        PhotoImage; the label is reconfigured only when the size changes.
+        """
+        size, data = preview
+        if self._photo is None or self._photo_size != size:
+            self._photo = tk.PhotoImage(width=size[0], height=size[1])
+            self._photo_size = size
+            self.camera_label.configure(image=self._photo, text="")
+        
+        # The put runs on the Tk thread and the label only redraws at idle,
+        # so it can never show a half-written image - no back buffer needed
+        self._photo.put(data)
+        
+    def _on_camera_label_configure(self, event):
+        """Remember the camera label size; the preview is fitted to it."""
+        label_size = (event.width, event.height)
+        if label_size != self._label_size:
+            self._label_size = label_size
+            self._display_cache = None
+    
+    def _get_display_size(self, frame):
+        """Return the cached (width, height) the preview is scaled to.
+        
+        Called from the analyzer worker while the Tk thread may reset the
+        cache, so the cache is a single (source, target) tuple read once.
+        """
+        src_h, src_w = frame.shape[:2]
+        cache = self._display_cache
+        if cache is not None and cache[0] == (src_w, src_h):
+            return cache[1]
+        
+        # Leave room for the label border/padding so the image never
+        # forces the label (and therefore the next Configure) to grow
+        label_w, label_h = self._label_size
+        box_w, box_h = label_w - 4, label_h - 4
+        if box_w < 160 or box_h < 120:
+            # Label not laid out yet - fall back to the default preview height
+            scale = 400 / src_h
+        else:
+            scale = min(box_w / src_w, box_h / src_h)
+        scale = min(scale, 1.0)
+        
+        display_size = (max(1, int(src_w * scale)), max(1, int(src_h * scale)))
+        self._display_cache = ((src_w, src_h), display_size)
+        return display_size
         
     def update_dashboard_stats(self):
         """Update dashboard statistics."""
-        try:
-            report = self.session_manager.generate_productivity_report(7)
-            
-            if "error" not in report:
-                self.stat_sessions.update_value(str(report['total_sessions']), animated=True)
-                self.stat_time.update_value(DataFormatter.format_duration(report['total_study_time']), animated=True)
-                self.stat_focus.update_value(f"{report['overall_focus_percentage']:.1f}%", animated=True)
-        except:
-            pass
+        report = self.session_manager.generate_productivity_report(7)
+        if not report or "error" in report:
+            return
+        
+        self.stat_sessions.update_value(str(report['total_sessions']), animated=True)
+        self.stat_time.update_value(DataFormatter.format_duration(report['total_study_time']), animated=True)
+        self.stat_focus.update_value(f"{report['overall_focus_percentage']:.1f}%", animated=True)
             
     def generate_report(self):
         """Generate productivity report."""
         try:
             days = int(self.report_period_var.get())
+            
+            # Nothing new was saved since the last render - keep the widget as is
+            cache_key = (days, self.session_manager.last_session_timestamp,
+                         datetime.now().date())
+            if cache_key == self._report_cache_key:
+                return
+            
             report = self.session_manager.generate_productivity_report(days)
             
             if "error" in report:
-                self.report_text.delete(1.0, tk.END)
-                self.report_text.insert(tk.END, f"No data available for the last {days} days.")
-                return
-                
-            report_text = f"""PRODUCTIVITY REPORT - Last {days} Days
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-OVERVIEW
-========
-Total Sessions: {report['total_sessions']}
-Total Study Time: {DataFormatter.format_duration(report['total_study_time'])}
-Average Session: {DataFormatter.format_duration(report['average_session_duration'])}
-Overall Focus: {report['overall_focus_percentage']:.1f}%
-Efficiency: {report['efficiency_percentage']:.1f}%
-Total Distractions: {report['total_distractions']}
-
-DAILY BREAKDOWN
-===============
-"""
-            for date, stats in report['daily_stats'].items():
-                report_text += f"{date}: {stats['sessions']} sessions, "
-                report_text += f"{DataFormatter.format_duration(stats['study_time'])}, "
-                report_text += f"{stats['distractions']} distractions\n"
-                
+                report_text = f"No data available for the last {days} days."
+            else:
+                header = REPORT_TPL.format_map({
+                    'days': days,
+                    'ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'total_sessions': report['total_sessions'],
+                    'total_study_time': DataFormatter.format_duration(report['total_study_time']),
+                    'average_session': DataFormatter.format_duration(report['average_session_duration']),
+                    'overall_focus': report['overall_focus_percentage'],
+                    'efficiency': report['efficiency_percentage'],
+                    'total_distractions': report['total_distractions'],
+                })
+                rows = [
+                    ROW_TPL.format_map({
+                        'date': date,
+                        'sessions': stats['sessions'],
+                        'study_time': DataFormatter.format_duration(stats['study_time']),
+                        'distractions': stats['distractions'],
+                    })
+                    for date, stats in report['daily_stats'].items()
+                ]
+                report_text = header + ''.join(rows)
+            
+            # Single delete + insert so the Text widget relayouts once
             self.report_text.delete(1.0, tk.END)
             self.report_text.insert(tk.END, report_text)
+            self._report_cache_key = cache_key
             
         except Exception as e:
             self.show_toast(f"Failed to generate report: {e}")
@@ -1502,64 +2339,79 @@ Great job studying!"""
         
     def add_link(self):
         """Add a new study material."""
-        dialog = AddLinkDialog(self.root, self.colors)
-        if dialog.result:
-            name, url, category = dialog.result
+        if self._add_link_dialog is None:
+            self._add_link_dialog = AddLinkDialog(self.root, self.colors)
+        result = self._add_link_dialog.ask()
+        if result:
+            name, url, category = result
             if self.materials_manager.add_quick_link(name, url, category):
-                self.load_materials()
+                # Cards in view are reused; only a newly visible row needs one
+                self.render_visible_materials()
                 self.show_toast("Material added successfully")
                 
+    def _on_setting_changed(self, config_key: str, var):
+        """Write one changed setting to config and apply it if it is cheap."""
+        try:
+            value = var.get()
+            if config_key in ("camera.device_index", "camera.preview_fps"):
+                value = int(value)
+        except (tk.TclError, ValueError):
+            return  # Half-typed entry - wait for a valid value
+        if config_key == "camera.preview_fps" and value <= 0:
+            return
+        
+        # Staged so that closing without Save doesn't persist them
+        if config_key in APPLY_ON_SAVE_SETTINGS:
+            self.config_manager.stage(config_key, value)
+            return
+        self.config_manager.set(config_key, value, save=False)
+        
+        if config_key == "notifications.sounds":
+            self._sounds_enabled = value
+            self.sound_manager.set_enabled(value)
+        elif config_key == "notifications.enabled":
+            self._notifications_enabled = value
+            self.notification_manager.set_enabled(value)
+        elif config_key == "focus_tracking.sensitivity":
+            self.focus_tracker.set_sensitivity(value)
+        elif config_key == "focus_tracking.show_outline":
+            self.focus_tracker.set_show_outline(value)
+        elif config_key == "camera.preview_fps":
+            # Picked up by the next scheduled frame
+            self._analysis_interval = 1.0 / value
+            self.focus_tracker.decode_fps = value
+            
     def save_settings(self):
         """Save application settings."""
         try:
-            # Get old values to check for changes
-            old_camera_index = self.config_manager.get("camera.device_index", 0)
-            new_camera_index = int(self.setting_camera_device_index.get())
-            old_theme = self.config_manager.get("theme.mode")
-            new_theme = self.setting_theme_mode.get()
-            
-            # Get sensitivity setting
-            new_sensitivity = self.setting_focus_tracking_sensitivity.get()
-            
-            # Get face outline setting
-            show_outline = self.setting_focus_tracking_show_outline.get()
-            
-            # Save all settings
-            self.config_manager.set("theme.mode", new_theme)
-            self.config_manager.set("focus_tracking.sensitivity", new_sensitivity)
-            self.config_manager.set("focus_tracking.show_outline", show_outline)
-            self.config_manager.set("camera.device_index", new_camera_index)
-            self.config_manager.set("notifications.sounds", self.setting_notifications_sounds.get())
-            self.config_manager.set("notifications.enabled", self.setting_notifications_enabled.get())
-            
-            self.sound_manager.set_enabled(self.setting_notifications_sounds.get())
-            self.notification_manager.set_enabled(self.setting_notifications_enabled.get())
-            
-            # Apply sensitivity change
-            self.focus_tracker.set_sensitivity(new_sensitivity)
-            
-            # Apply face outline setting
-            self.focus_tracker.set_show_outline(show_outline)
+            # Every other setting is already in config (see _on_setting_changed);
+            # the staged theme and camera are committed and applied here
+            self.config_manager.commit_staged()
+            new_camera_index = self.config_manager.get("camera.device_index", 0)
+            new_theme = self.config_manager.get("theme.mode")
+            theme_changed = new_theme != self._active_theme
             
             # Apply theme change immediately
-            if old_theme != new_theme:
+            if theme_changed:
                 self.show_toast(f"Switching to {new_theme} mode...")
                 self.root.after(100, self.apply_theme_change)
             
             # Reinitialize camera if index changed
-            if old_camera_index != new_camera_index:
+            if new_camera_index != self._active_camera_index:
                 if self.session_active:
                     self.show_toast("Please end current session to change camera")
                 else:
                     self.show_toast("Reinitializing camera...")
                     if self.focus_tracker.initialize_camera(new_camera_index):
+                        self._active_camera_index = new_camera_index
                         self.show_toast(f"Camera {new_camera_index} initialized successfully!")
                     else:
                         self.show_toast(f"Failed to initialize camera {new_camera_index}")
                         # Revert to old camera index
-                        self.config_manager.set("camera.device_index", old_camera_index)
-                        self.focus_tracker.initialize_camera(old_camera_index)
-            elif old_theme == new_theme:
+                        self.config_manager.set("camera.device_index", self._active_camera_index)
+                        self.setting_camera_device_index.set(str(self._active_camera_index))
+                        self.focus_tracker.initialize_camera(self._active_camera_index)
+            elif not theme_changed:
                 # Only show this message if theme didn't change
                 self.show_toast("Settings saved successfully!")
                 
@@ -1577,98 +2429,96 @@ Great job studying!"""
     
     def apply_theme_change(self):
         """Apply theme change to all UI elements without restarting."""
-        # Get new theme colors
+        # Get new theme colors; widgets still show the old ones, which is how
+        # their color roles are recognised the first time round
+        old_roles = {}
+        for role in _THEME_ROLE_ORDER + tuple(self.colors):
+            if role in self.colors:
+                old_roles.setdefault(self.colors[role].lower(), role)
         self.colors = self.config_manager.get_theme_colors()
+        self._active_theme = self.config_manager.get("theme.mode")
         
         # Update root window
         self.root.configure(bg=self.colors["bg"])
         
         # Update all views
         for view in self.views.values():
-            self.update_widget_theme(view)
+            self.update_widget_theme(view, old_roles)
         
         # Update content area
         if hasattr(self, 'content_area'):
             self.content_area.configure(bg=self.colors["bg"])
         
         # Update sidebar buttons
-        for name, btn in self.sidebar_buttons.items():
-            if name == self.current_view:
-                btn.config(bg=self.colors["accent_primary"], 
-                          fg=self.colors["bg"])
-            else:
-                btn.config(bg=self.colors["bg_secondary"], 
-                          fg=self.colors["fg"])
+        self.configure_nav_styles()
         
         # Update specific widgets that need manual refresh
         self.update_special_widgets()
         
+        # Hidden dialogs were built with the old colors; rebuild on next open
+        for attr in ("_recent_dialog", "_upload_dialog"):
+            dialog = getattr(self, attr)
+            if dialog is not None:
+                dialog.destroy()
+                setattr(self, attr, None)
+        if self._add_link_dialog is not None:
+            self._add_link_dialog.dialog.destroy()
+            self._add_link_dialog = None
+        self._recent_dialog_sessions = None
+        
+        # Pooled material cards captured the old colors in their handlers
+        if hasattr(self, 'materials_canvas'):
+            self._reset_material_pool()
+        
+        # _ui_tick skips unchanged focus state, so re-queue it to pick up
+        # the new status colors
+        if 'is_focused' in self._last_state:
+            with self._state_lock:
+                self._pending_state.setdefault('is_focused', self._last_state.pop('is_focused'))
+        
         current_mode = self.config_manager.get("theme.mode")
         self.show_toast(f"✓ {current_mode.capitalize()} mode applied!")
     
-    def update_widget_theme(self, widget):
-        """Recursively update theme for a widget and its children."""
-        try:
-            # Get widget type
-            widget_class = widget.winfo_class()
-            
-            # Update based on widget type
-            if widget_class == 'Frame':
-                current_bg = str(widget.cget('bg'))
-                # Map old colors to new colors
-                if '#' in current_bg or current_bg in ['SystemButtonFace', 'white', 'black']:
-                    # Determine which background to use based on context
-                    if hasattr(widget, '_card_widget'):
-                        widget.configure(bg=self.colors["card_bg"])
-                    elif hasattr(widget, '_secondary_bg'):
-                        widget.configure(bg=self.colors["bg_secondary"])
-                    else:
-                        widget.configure(bg=self.colors["bg"])
-            
-            elif widget_class == 'Label':
-                current_bg = str(widget.cget('bg'))
-                current_fg = str(widget.cget('fg'))
-                
-                # Update background
-                if '#' in current_bg:
-                    if 'card' in current_bg or 'Card' in str(widget):
-                        widget.configure(bg=self.colors["card_bg"])
-                    elif 'secondary' in current_bg:
-                        widget.configure(bg=self.colors["bg_secondary"])
-                    else:
-                        widget.configure(bg=self.colors["bg"])
-                
-                # Update foreground based on current color role
-                if '#' in current_fg:
-                    # Try to determine if it's a primary, secondary, or accent color
-                    if 'accent' in str(widget.cget('font')) or 'bold' in str(widget.cget('font')):
-                        widget.configure(fg=self.colors["fg"])
-                    else:
-                        widget.configure(fg=self.colors["fg_secondary"])
-            
-            elif widget_class in ['Entry', 'Text']:
-                widget.configure(
-                    bg=self.colors["input_bg"],
-                    fg=self.colors["input_fg"],
-                    insertbackground=self.colors["fg"]
-                )
-            
-            elif widget_class == 'Canvas':
-                widget.configure(bg=self.colors["bg"])
-            
-            elif widget_class == 'Button':
-                widget.configure(
-                    bg=self.colors["button_bg"],
-                    fg=self.colors["button_fg"]
-                )
-            
-            # Recursively update children
-            for child in widget.winfo_children():
-                self.update_widget_theme(child)
-                
-        except Exception as e:
-            # Skip widgets that don't support theme updates
-            pass
+    def update_widget_theme(self, widget, old_roles):
+        """Update theme for a widget and all of its descendants."""
+        # Plain loop with locals: one method call and two attribute lookups
+        # per widget add up over a few hundred widgets
+        colors = self.colors
+        infer = self._infer_theme_roles
+        stack = [widget]
+        while stack:
+            widget = stack.pop()
+            # Queued first so a widget that fails below still has its
+            # children themed
+            try:
+                stack.extend(widget.winfo_children())
+            except tk.TclError:
+                continue  # Destroyed while the walk was running
+            try:
+                # Roles are worked out once per widget and kept on it, so later
+                # theme switches are a plain configure with no cget round-trips
+                roles = getattr(widget, "_theme_roles", None)
+                if roles is None:
+                    roles = widget._theme_roles = infer(widget, old_roles)
+                if roles:
+                    widget.configure(**{option: colors[role] for option, role in roles})
+            except Exception:
+                # Skip widgets that don't support theme updates
+                pass
+        
+    def _infer_theme_roles(self, widget, old_roles):
+        """Map a widget's color options to theme color names by exact match."""
+        widget_class = widget.winfo_class()
+        if widget_class in ('Entry', 'Text'):
+            return (("bg", "input_bg"), ("fg", "input_fg"), ("insertbackground", "fg"))
+        
+        options = _THEMED_OPTIONS.get(widget_class, ())
+        roles = []
+        for option in options:
+            role = old_roles.get(str(widget.cget(option)).lower())
+            if role is not None:
+                roles.append((option, role))
+        return tuple(roles)
     
     def update_special_widgets(self):
         """Update special widgets that need manual configuration."""
@@ -1695,7 +2545,7 @@ Great job studying!"""
                 )
             
             # Update camera label
-            if hasattr(self, 'camera_label'):
+            if self.camera_label is not None:
                 self.camera_label.configure(
                     bg=self.colors["bg_secondary"],
                     fg=self.colors["fg_muted"]
@@ -1718,17 +2568,11 @@ Great job studying!"""
                     fg=self.colors["fg_secondary"]
                 )
             
-            # Update timer display
-            if hasattr(self, 'timer_display'):
-                self.timer_display.configure(
-                    bg=self.colors["card_bg"],
-                    fg=self.colors["fg"]
-                )
-            
-            # Update circular progress colors
-            if hasattr(self, 'timer_progress'):
+            # Update circular progress colors and timer text
+            if self.timer_progress is not None:
                 self.timer_progress.color = self.colors["accent_primary"]
                 self.timer_progress.bg_color = self.colors["bg_secondary"]
+                self.timer_progress.set_text_color(self.colors["fg"])
                 self.timer_progress.update_display()
             
             # Update ModernButton colors (they need special handling)
@@ -1737,40 +2581,25 @@ Great job studying!"""
         except Exception as e:
             print(f"Error updating special widgets: {e}")
     
-    def update_modern_buttons(self):
-        """Update all ModernButton instances."""
-        # This method updates buttons by finding them in the widget tree
-        def update_buttons_recursive(widget):
-            try:
-                if isinstance(widget, ModernButton):
-                    # Determine semantic role from current fill color
-                    fill = None
-                    try:
-                        # Attempt to read internal bg polygon fill
-                        fill = widget.itemcget(widget._bg_item, 'fill')
-                    except Exception:
-                        pass
-                    # Map old fill to new theme colors (basic heuristic)
-                    if fill in ["#6366F1", self.colors.get("accent_primary")]:
-                        widget.set_colors(self.colors["accent_primary"], self.colors["bg"], self.colors["accent_secondary"])
-                    elif fill in ["#EF4444", self.colors.get("accent_danger")]:
-                        widget.set_colors(self.colors["accent_danger"], "#FFFFFF", "#DC2626")
-                    elif fill in ["#64748B"]:
-                        # Muted button (pause/resume)
-                        widget.set_colors("#64748B" if self.config_manager.get("theme.mode") == "light" else "#475569", "#FFFFFF", "#94A3B8")
-                    else:
-                        # Default card background style button
-                        widget.set_colors(self.colors["accent_primary"], self.colors["bg"], self.colors["accent_secondary"])
-                    # Ensure canvas bg matches surrounding card
-                    widget.configure(bg=self.colors["card_bg"])
-                
-                for child in widget.winfo_children():
-                    update_buttons_recursive(child)
-            except:
-                pass
+    def _track_button(self, button, role="default"):
+        """Register a ModernButton so theme changes recolor it by role."""
+        button.set_role(role)
+        self._modern_buttons.append(button)
         
-        if hasattr(self, 'content_area'):
-            update_buttons_recursive(self.content_area)
+    def update_modern_buttons(self):
+        """Recolor every registered ModernButton from its semantic role."""
+        colors = self.colors
+        muted = "#64748B" if self.config_manager.get("theme.mode") == "light" else "#475569"
+        primary = (colors["accent_primary"], colors["bg"], colors["accent_secondary"])
+        role_colors = {
+            "danger": (colors["accent_danger"], "#FFFFFF", "#DC2626"),
+            "muted": (muted, "#FFFFFF", "#94A3B8"),
+        }
+        
+        # Buttons on cards that were rebuilt since the last change drop out here
+        self._modern_buttons = [b for b in self._modern_buttons if b.winfo_exists()]
+        for button in self._modern_buttons:
+            button.set_colors(*role_colors.get(button.semantic_role, primary))
         
     def show_toast(self, message: str):
         """Show toast notification."""
@@ -1785,9 +2614,27 @@ Great job studying!"""
             else:
                 return
                 
-        self.running = False
-        self.focus_tracker.cleanup()
-        self.session_manager.cleanup()
+        self._stop_analyzer()
+        # A pending AI answer may still arrive; keep it out of the saved history
+        self.ai_assistant.close_history()
+        
+        # Hide the window right away. Pending I/O (a pooled chat history
+        # save included) finishes first so the final flush cannot race it.
+        self.root.withdraw()
+        if self._history_flush_job is not None:
+            self.root.after_cancel(self._history_flush_job)
+            self._history_flush_job = None
+        self._io_executor.shutdown(wait=True)
+        
+        # Then release the camera and flush/join the writers side by side;
+        # none of these touch Tk
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(cleanup) for cleanup in (
+                self.focus_tracker.cleanup, self.session_manager.cleanup,
+                self.config_manager.flush, self.ai_assistant.flush_chat_history)]
+        for future in futures:
+            if future.exception() is not None:
+                print(f"Error during cleanup: {future.exception()}")
         self.root.quit()
         self.root.destroy()
         
@@ -1804,13 +2651,17 @@ class AddLinkDialog:
     def __init__(self, parent, colors):
         self.result = None
         self.colors = colors
+        self.parent = parent
         
+        # Built hidden once; ask() shows it again for every new link
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()
         self.dialog.title("Add Study Material")
         self.dialog.geometry("450x300")
         self.dialog.transient(parent)
-        self.dialog.grab_set()
         self.dialog.configure(bg=colors["bg"])
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self._closed = tk.BooleanVar(self.dialog, value=True)
         
         # Content
         content = tk.Frame(self.dialog, bg=colors["bg"])
@@ -1855,15 +2706,36 @@ class AddLinkDialog:
         add_btn.config(bg=colors["bg"])
         add_btn.pack(side=tk.LEFT, padx=5)
         
-        cancel_btn = ModernButton(button_frame, text="Cancel", command=self.dialog.destroy,
+        cancel_btn = ModernButton(button_frame, text="Cancel", command=self.close,
                                  width=100, height=45,
                                  bg_color=colors["button_bg"],
                                  text_color=colors["fg"])
         cancel_btn.config(bg=colors["bg"])
         cancel_btn.pack(side=tk.LEFT, padx=5)
         
+    def ask(self):
+        """Show the dialog and block until it is closed; return the new link or None."""
+        self.result = None
+        self.name_var.set("")
+        self.url_var.set("")
+        self.category_var.set("Custom")
+        
         # Center dialog
+        parent = self.parent
         self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        
+        # Block until closed so the caller can read self.result
+        self._closed.set(False)
+        parent.wait_variable(self._closed)
+        return self.result
+        
+    def close(self):
+        """Hide the dialog so the next ask() can reuse it."""
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        self._closed.set(True)
         
     def add_link(self):
         """Add the link and close dialog."""
@@ -1873,6 +2745,6 @@ class AddLinkDialog:
         
         if name and url:
             self.result = (name, url, category)
-            self.dialog.destroy()
+            self.close()
         else:
             messagebox.showerror("Error", "Please enter both name and URL")
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
 import os
+import numpy as np
 
 class SessionManager:
     """Manages study sessions, timers, and data logging."""
@@ -33,6 +34,9 @@ class SessionManager:
         # Timer thread
         self.timer_thread = None
         self.stop_timer = False
+        # Set alongside stop_timer so the timer wakes at once instead of
+        # finishing its current one-second sleep
+        self._timer_wake = threading.Event()
         
         # Session timing
         self.session_start_time = None
@@ -59,8 +63,16 @@ class SessionManager:
         self.break_reminder_callback = None
         self.session_update_callback = None
         
-        # Focus data
-        self.focus_events = []
+        # Focus data - preallocated columns, filled up to _n
+        self._ts = np.empty(0, dtype=np.float64)
+        self._scores = np.empty(0, dtype=np.float64)
+        self._focused = np.empty(0, dtype=np.bool_)
+        self._n = 0
+        
+        # Time the most recent session file was written (for report caching)
+        self.last_session_timestamp = 0.0
+        # Productivity reports by days, valid while the key below is unchanged
+        self._report_cache = {}
         
         # Background save queue to avoid blocking UI on disk writes
         self._save_queue = queue.Queue()
@@ -149,7 +161,13 @@ class SessionManager:
         self.session_active = True
         self.session_start_time = time.time()
         self.total_pause_time = 0
-        self.focus_events.clear()
+        
+        # Room for a full session at 10 samples/second, plus some slack
+        capacity = int(self.current_session["duration_planned"]) * 10 + 1024
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._scores = np.empty(capacity, dtype=np.float64)
+        self._focused = np.empty(capacity, dtype=np.bool_)
+        self._n = 0
         
         # Start timer thread
         self.start_timer_thread()
@@ -180,6 +198,7 @@ class SessionManager:
             
         self.session_active = False
         self.stop_timer = True
+        self._timer_wake.set()
         
         # Calculate actual duration
         end_time = time.time()
@@ -189,7 +208,7 @@ class SessionManager:
             "end_time": datetime.now(),
             "duration_actual": actual_duration,
             "paused_time": self.total_pause_time,
-            "focus_data": self.focus_events.copy()
+            "focus_data": self._focus_data_records()
         })
         
         # Save session to file
@@ -217,18 +236,57 @@ class SessionManager:
         print(f"Started {break_type} break for {duration} minutes")
         return True
         
+    def _reserve(self, count: int):
+        """Make room for count more focus samples, doubling capacity as needed."""
+        needed = self._n + count
+        if needed <= len(self._ts):
+            return
+        capacity = max(needed, len(self._ts) * 2, 1024)
+        for name in ("_ts", "_scores", "_focused"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+            
     def log_focus_event(self, focus_score: float, is_focused: bool):
         """Log a focus tracking event."""
-        event = {
-            "timestamp": time.time(),
-            "focus_score": focus_score,
-            "is_focused": is_focused
+        self._reserve(1)
+        self._ts[self._n] = time.time()
+        self._scores[self._n] = focus_score
+        self._focused[self._n] = is_focused
+        self._n += 1
+            
+    def log_focus_events_bulk(self, events: List[tuple]):
+        """Log a batch of (timestamp, focus_score, is_focused) samples."""
+        count = len(events)
+        if not count:
+            return
+        
+        batch = np.asarray(events, dtype=np.float64).reshape(count, 3)
+        self._reserve(count)
+        end = self._n + count
+        self._ts[self._n:end] = batch[:, 0]
+        self._scores[self._n:end] = batch[:, 1]
+        self._focused[self._n:end] = batch[:, 2] != 0
+        self._n = end
+        
+    def get_focus_summary(self) -> Dict[str, float]:
+        """Get average focus score and focus percentage for the logged samples."""
+        if self._n == 0:
+            return {"average_focus_score": 0.0, "focus_percentage": 0.0}
+        return {
+            "average_focus_score": float(self._scores[:self._n].mean()),
+            "focus_percentage": float(self._focused[:self._n].mean() * 100)
         }
         
-        self.focus_events.append(event)
-        
-        if self.current_session:
-            self.current_session["focus_data"].append(event)
+    def _focus_data_records(self) -> List[Dict[str, Any]]:
+        """Convert the logged samples to the per-event dicts stored on disk."""
+        return [
+            {"timestamp": ts, "focus_score": score, "is_focused": focused}
+            for ts, score, focused in zip(self._ts[:self._n].tolist(),
+                                          self._scores[:self._n].tolist(),
+                                          self._focused[:self._n].tolist())
+        ]
             
     def log_distraction_event(self):
         """Log a distraction event."""
@@ -268,6 +326,7 @@ class SessionManager:
     def start_timer_thread(self):
         """Start the session timer thread."""
         self.stop_timer = False
+        self._timer_wake.clear()
         self.timer_thread = threading.Thread(target=self.timer_loop)
         self.timer_thread.daemon = True
         self.timer_thread.start()
@@ -275,7 +334,8 @@ class SessionManager:
     def timer_loop(self):
         """Main timer loop running in separate thread."""
         while not self.stop_timer and self.session_active:
-            time.sleep(1)
+            if self._timer_wake.wait(1):
+                break
             
             if self.paused:
                 continue
@@ -310,7 +370,10 @@ class SessionManager:
         
         # Queue both file and CSV saves
         self._save_queue.put(("session", session_data.copy()))
-        self._save_queue.put(("csv", session_data.copy()))
+        # The CSV row takes the percentage from the focus buffers; the JSON stays as before
+        csv_data = session_data.copy()
+        csv_data["focus_percentage"] = self.get_focus_summary()["focus_percentage"]
+        self._save_queue.put(("csv", csv_data))
         
         return session_data
     
@@ -320,6 +383,7 @@ class SessionManager:
             session_file = self.sessions_dir / f"{session_data['id']}.json"
             with open(session_file, 'w', encoding='utf-8') as f:
                 json.dump(session_data, f, indent=2, default=str, ensure_ascii=False)
+            self.last_session_timestamp = time.time()
         except Exception as e:
             print(f"Error saving session file: {e}")
     
@@ -335,7 +399,9 @@ class SessionManager:
         
         # Calculate focus percentage
         focus_data = session_data.get("focus_data", [])
-        if focus_data:
+        if "focus_percentage" in session_data:
+            focus_percentage = session_data["focus_percentage"]
+        elif focus_data:
             focused_events = sum(1 for event in focus_data if event.get("is_focused", False))
             focus_percentage = (focused_events / len(focus_data)) * 100
         else:
@@ -387,7 +453,20 @@ class SessionManager:
         return sessions
         
     def generate_productivity_report(self, days: int = 7) -> Dict[str, Any]:
-        """Generate productivity report for specified number of days."""
+        """Generate productivity report for specified number of days (cached)."""
+        # Reports only change when a session is saved or the day rolls over;
+        # the dashboard and analytics view ask for them far more often
+        key = (self.last_session_timestamp, datetime.now().date())
+        cached = self._report_cache.get(days)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        report = self._build_productivity_report(days)
+        self._report_cache[days] = (key, report)
+        return report
+        
+    def _build_productivity_report(self, days: int) -> Dict[str, Any]:
+        """Scan the saved sessions and build a productivity report."""
         cutoff_date = datetime.now() - timedelta(days=days)
         sessions = self.load_session_history(limit=200)
         
@@ -455,6 +534,7 @@ class SessionManager:
     def cleanup(self):
         """Clean up resources."""
         self.stop_timer = True
+        self._timer_wake.set()
         if self.timer_thread and self.timer_thread.is_alive():
             self.timer_thread.join(timeout=1)
         # Stop save worker
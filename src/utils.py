@@ -19,12 +19,26 @@ try:
 except ImportError:
     PYGAME_AVAILABLE = False
 
+try:
+    import winsound
+    WINSOUND_AVAILABLE = True
+except ImportError:
+    WINSOUND_AVAILABLE = False
+
 try:
     import plyer
     PLYER_AVAILABLE = True
 except ImportError:
     PLYER_AVAILABLE = False
 
+try:
+    import gi
+    gi.require_version('Notify', '0.7')
+    from gi.repository import Notify
+    NOTIFY_AVAILABLE = True
+except (ImportError, ValueError):
+    NOTIFY_AVAILABLE = False
+
 class SoundManager:
     """Manages alert sounds and audio notifications."""
     
@@ -49,8 +63,44 @@ class SoundManager:
             self.pygame_available = False
             print("pygame not available - sounds disabled")
             
+    def preload(self, sound_name: str) -> bool:
+        """Load and decode a sound from sounds_dir once so alerts play from memory."""
+        if sound_name in self.sounds:
+            return True
+            
+        sound_file = self.sounds_dir / f"{sound_name}.wav"
+        if not sound_file.exists():
+            return False
+            
+        try:
+            if self.pygame_available:
+                import pygame
+                self.sounds[sound_name] = pygame.mixer.Sound(str(sound_file))
+            elif WINSOUND_AVAILABLE:
+                with open(sound_file, 'rb') as f:
+                    self.sounds[sound_name] = f.read()
+            else:
+                return False
+            return True
+        except Exception as e:
+            print(f"Error loading sound {sound_name}: {e}")
+            return False
+            
     def play_sound(self, sound_name: str):
         """Play a sound by name."""
+        sound = self.sounds.get(sound_name)
+        if self.enabled and sound is not None:
+            try:
+                if isinstance(sound, bytes):
+                    # winsound cannot play from memory asynchronously; callers
+                    # already run this off the UI thread
+                    winsound.PlaySound(sound, winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+                else:
+                    sound.play()
+                return
+            except Exception as e:
+                print(f"Error playing sound {sound_name}: {e}")
+                
         if not self.enabled or not self.pygame_available:
             # Fallback to console alert
             if "distraction" in sound_name.lower():
@@ -77,17 +127,37 @@ class NotificationManager:
     def __init__(self):
         self.enabled = True
         self.plyer_available = PLYER_AVAILABLE
+        self.notify_available = NOTIFY_AVAILABLE and platform.system() == "Linux"
+        
+        # Backend objects are created on first use and reused afterwards
+        self._notif_obj = None
+        self._notifier = None
         
     def show_notification(self, title: str, message: str, duration: int = 5000):
         """Show a system notification."""
         if not self.enabled:
             return
             
+        try:
+            if self.notify_available:
+                # libnotify: one Notification object, updated in place
+                if self._notif_obj is None:
+                    Notify.init("Study Focus")
+                    self._notif_obj = Notify.Notification.new(title, message)
+                else:
+                    self._notif_obj.update(title, message)
+                self._notif_obj.set_timeout(duration)
+                self._notif_obj.show()
+                return
+        except Exception:
+            self.notify_available = False
+            
         try:
             if self.plyer_available:
                 # Use plyer for cross-platform notifications
-                import plyer
-                plyer.notification.notify(
+                if self._notifier is None:
+                    self._notifier = plyer.notification
+                self._notifier.notify(
                     title=title,
                     message=message,
                     timeout=duration//1000
@@ -165,7 +235,8 @@ class ConfigManager:
             },
             "camera": {
                 "device_index": 0,
-                "resolution": {"width": 640, "height": 480}
+                "resolution": {"width": 640, "height": 480},
+                "preview_fps": 10
             },
             "focus_tracking": {
                 "sensitivity": "medium",
@@ -182,6 +253,10 @@ class ConfigManager:
         # Cache for theme colors to avoid repeated dict construction
         self._theme_colors_cache = None
         self._cached_theme_mode = None
+        # Set by set(..., save=False) until the next save_config/flush
+        self._dirty = False
+        # Values held back by stage() until commit_staged; flush never writes them
+        self._staged = {}
         
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file."""
@@ -203,6 +278,7 @@ class ConfigManager:
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._dirty = False
         except Exception as e:
             print(f"Error saving config: {e}")
             
@@ -218,7 +294,7 @@ class ConfigManager:
         except (KeyError, TypeError):
             return default
             
-    def set(self, key_path: str, value: Any):
+    def set(self, key_path: str, value: Any, save: bool = True):
         """Set configuration value using dot notation."""
         keys = key_path.split('.')
         config = self.config
@@ -229,10 +305,31 @@ class ConfigManager:
             config = config[key]
             
         config[keys[-1]] = value
+        # A direct set supersedes anything staged for the same key
+        self._staged.pop(key_path, None)
         # Invalidate theme cache if theme mode changed
         if keys[0] == "theme" and keys[-1] == "mode":
             self._theme_colors_cache = None
             self._cached_theme_mode = None
+        if save:
+            self.save_config()
+        else:
+            self._dirty = True
+            
+    def flush(self):
+        """Write configuration to disk if any unsaved changes are pending."""
+        if self._dirty:
+            self.save_config()
+            
+    def stage(self, key_path: str, value: Any):
+        """Hold a value back from config until commit_staged is called."""
+        self._staged[key_path] = value
+        
+    def commit_staged(self):
+        """Move staged values into config and save it."""
+        staged, self._staged = self._staged, {}
+        for key_path, value in staged.items():
+            self.set(key_path, value, save=False)
         self.save_config()
         
     def get_theme_colors(self) -> Dict[str, str]:
@@ -0,0 +1,36 @@
+"""Tests for ConfigManager."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import ConfigManager
+
+
+def read_config(config_manager):
+    with open(config_manager.config_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_flush_does_not_write_staged_theme(tmp_path):
+    config_manager = ConfigManager(str(tmp_path))
+    config_manager.save_config()
+    
+    config_manager.stage("theme.mode", "dark")
+    config_manager.set("notifications.sounds", False, save=False)
+    config_manager.flush()
+    
+    saved = read_config(config_manager)
+    assert saved["theme"]["mode"] == "light"
+    assert saved["notifications"]["sounds"] is False
+    
+    
+def test_commit_staged_writes_theme(tmp_path):
+    config_manager = ConfigManager(str(tmp_path))
+    config_manager.stage("theme.mode", "dark")
+    config_manager.commit_staged()
+    
+    assert config_manager.get("theme.mode") == "dark"
+    assert read_config(config_manager)["theme"]["mode"] == "dark"